@@ -0,0 +1,37 @@
+import os
+
+__all__ = ["JSONLExporter", "ParquetExporter", "ArrowStreamExporter", "open_exporter"]
+
+
+def open_exporter(path: str):
+    """
+    Pick an exporter from the file extension: .jsonl, .parquet or .arrow.
+
+    A path with a trailing separator or no extension is a Parquet dataset
+    directory (created if missing) that gets a new part file per run.
+    """
+    ext = os.path.splitext(path.rstrip("/" + os.sep))[1].lower()
+    if ext in {".jsonl", ".ndjson"}:
+        from .jsonl_exporter import JSONLExporter
+        return JSONLExporter(path)
+    if path.endswith(("/", os.sep)) or not ext or os.path.isdir(path):
+        from .arrow_exporter import ParquetExporter
+        os.makedirs(path, exist_ok=True)
+        return ParquetExporter(path)
+    if ext == ".parquet":
+        from .arrow_exporter import ParquetExporter
+        return ParquetExporter(path)
+    if ext in {".arrow", ".arrows"}:
+        from .arrow_exporter import ArrowStreamExporter
+        return ArrowStreamExporter(path)
+    raise ValueError(f"Unsupported export format: {path}")
+
+
+def __getattr__(name):
+    if name == "JSONLExporter":
+        from .jsonl_exporter import JSONLExporter
+        return JSONLExporter
+    if name in {"ParquetExporter", "ArrowStreamExporter"}:
+        from . import arrow_exporter
+        return getattr(arrow_exporter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
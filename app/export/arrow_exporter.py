@@ -0,0 +1,84 @@
+import os
+import uuid
+from typing import List, Dict, Any
+from .base import Exporter, EXPORT_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+def export_schema():
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("doc_id", categorical),
+        ("clause_id", pa.string()),
+        ("clause_no", pa.int32()),
+        ("page", pa.int32()),
+        ("kind", categorical),
+        ("severity", categorical),
+        ("category", categorical),
+        ("actor", categorical),
+        ("deadline", pa.string()),
+        ("finding", pa.string()),
+        ("excerpt", pa.string()),
+    ])
+
+def _record_batch(rows: List[Dict[str, Any]], schema) -> "pa.RecordBatch":
+    columns = []
+    for name in EXPORT_FIELDS:
+        values = [row.get(name) for row in rows]
+        field_type = schema.field(name).type
+        if pa.types.is_dictionary(field_type) or pa.types.is_string(field_type):
+            # Model output is not type-checked; keep the schema fixed whatever it returns.
+            values = [None if v is None else str(v) for v in values]
+        if pa.types.is_dictionary(field_type):
+            columns.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            columns.append(pa.array(values, type=field_type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+class _ArrowExporter(Exporter):
+    def __init__(self):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet/Arrow export: pip install pyarrow")
+        self.schema = export_schema()
+
+class ParquetExporter(_ArrowExporter):
+    """
+    Streams findings into a Parquet file, one row group per batch.
+
+    If ``path`` is a directory, a new part file is added to it so repeated
+    corpus runs append to the same dataset.
+    """
+
+    def __init__(self, path: str, compression: str = "zstd"):
+        super().__init__()
+        if os.path.isdir(path):
+            path = os.path.join(path, f"part-{uuid.uuid4().hex}.parquet")
+        self.path = path
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self._writer.write_batch(_record_batch(rows, self.schema))
+
+    def close(self):
+        self._writer.close()
+
+class ArrowStreamExporter(_ArrowExporter):
+    """Streams findings as Arrow IPC record batches."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self._writer.write_batch(_record_batch(rows, self.schema))
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterator, Optional
+
+# Fixed row schema: one row per risk or obligation found in a clause.
+EXPORT_FIELDS = [
+    "doc_id", "clause_id", "clause_no", "page", "kind",
+    "severity", "category", "actor", "deadline", "finding", "excerpt",
+]
+
+def finding_rows(doc_id: str, table, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    stop = table.analysed if stop is None else min(stop, table.analysed)
+    for idx in range(start, stop):
+        base = {
+            "doc_id": doc_id,
+            "clause_id": table.ids[idx],
+            "clause_no": idx + 1,
+            "page": table.pages[idx],
+            "excerpt": (table.texts[idx] or "")[:table.EXCERPT_CHARS],
+        }
+        for r in table.risks(idx):
+            yield {**base, "kind": "risk", "severity": r["severity"], "category": r["category"],
+                   "actor": None, "deadline": None, "finding": r["description"]}
+        for o in table.obligations(idx):
+            yield {**base, "kind": "obligation", "severity": None, "category": None,
+                   "actor": o["actor"], "deadline": o["deadline"], "finding": o["action"]}
+
+class Exporter(ABC):
+    @abstractmethod
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def write_table(self, doc_id: str, table, start: int = 0, stop: Optional[int] = None):
+        rows = list(finding_rows(doc_id, table, start, stop))
+        if rows:
+            self.write_rows(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
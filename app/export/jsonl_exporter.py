@@ -0,0 +1,16 @@
+import json
+from typing import List, Dict, Any
+from .base import Exporter, EXPORT_FIELDS
+
+class JSONLExporter(Exporter):
+    """Appends one JSON object per finding; flushed after every batch."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps({k: row.get(k) for k in EXPORT_FIELDS}) + "\n" for row in rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
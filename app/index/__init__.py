@@ -0,0 +1 @@
+from .sqlite_index import SQLiteCorpusIndex
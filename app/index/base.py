@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+class CorpusIndex(ABC):
+    @abstractmethod
+    def add_document(self, name: str, results: Any, source: str = "", analysed_at: Optional[str] = None) -> int:
+        pass
+
+    @abstractmethod
+    def query_obligations(self, **filters) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def query_risks(self, **filters) -> List[Dict[str, Any]]:
+        pass
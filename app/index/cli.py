@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.index.sqlite_index import SQLiteCorpusIndex
+
+DEFAULT_DB = os.getenv("CORPUS_INDEX_PATH", "corpus_index.db")
+
+
+def _print_rows(rows, fields, as_json: bool):
+    if as_json:
+        for row in rows:
+            print(json.dumps(row))
+        return
+    for row in rows:
+        where = f"{row['document']} p{row['page']} clause {row['clause']}"
+        details = " | ".join(str(row.get(f)) for f in fields)
+        print(f"{where}: {details}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the corpus index of analysed contracts.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Path to the SQLite index.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per match.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Index a run saved with graph_pipeline.main --save.")
+    add.add_argument("run", help="Saved run JSON file.")
+    add.add_argument("--name", default=None, help="Document name (defaults to the run file name).")
+
+    obligations = sub.add_parser("obligations", help="Find obligations.")
+    obligations.add_argument("--actor", default=None)
+    obligations.add_argument("--due-within", type=int, default=None, help="Due between today and N days from now.")
+    obligations.add_argument("--due-before", default=None, help="ISO date upper bound.")
+    obligations.add_argument("--due-after", default=None, help="ISO date lower bound.")
+    obligations.add_argument("--offset-within", type=int, default=None, help="Relative deadlines of at most N days (e.g. 'within 30 days of notice').")
+    obligations.add_argument("--text", default=None, help="FTS5 query over clause text.")
+    obligations.add_argument("--limit", type=int, default=100)
+
+    risks = sub.add_parser("risks", help="Find risks.")
+    risks.add_argument("--severity", default=None)
+    risks.add_argument("--category", default=None)
+    risks.add_argument("--text", default=None, help="FTS5 query over clause text.")
+    risks.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args()
+
+    with SQLiteCorpusIndex(args.db) as index:
+        started = time.perf_counter()
+        if args.command == "add":
+            from graph_pipeline.results import load_run
+            _, results = load_run(args.run)
+            name = args.name or os.path.splitext(os.path.basename(args.run))[0]
+            index.add_document(name, results, source=args.run)
+            print(f"Indexed {len(results)} clauses from {name}")
+            return
+        try:
+            if args.command == "obligations":
+                rows = index.query_obligations(
+                    actor=args.actor,
+                    due_within_days=args.due_within,
+                    due_before=args.due_before,
+                    due_after=args.due_after,
+                    offset_within_days=args.offset_within,
+                    text=args.text,
+                    limit=args.limit,
+                )
+                fields = ["actor", "action", "deadline", "due_date"]
+            else:
+                rows = index.query_risks(severity=args.severity, category=args.category, text=args.text, limit=args.limit)
+                fields = ["severity", "category", "description"]
+        except ValueError as e:
+            parser.error(str(e))
+        _print_rows(rows, fields, args.json)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"{len(rows)} matches in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import re
+from datetime import date, datetime
+from typing import Optional
+
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_SLASH = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_RELATIVE = re.compile(r"(\d+)\)?\s*(business\s+|calendar\s+)?(day|week|month|year)s?\b", re.IGNORECASE)
+_DATE_FORMATS = ("%B %d, %Y", "%B %d %Y", "%b %d, %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y")
+_MONTH_DATE = re.compile(r"\b(?:\d{1,2}\s+)?[A-Z][a-z]{2,8}\.?\s+(?:\d{1,2},?\s+)?\d{4}\b")
+
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+
+def normalize_deadline(text: Optional[str]) -> Optional[str]:
+    """
+    Best-effort ISO date for an extracted deadline.
+
+    Only absolute dates are recognised. Relative deadlines ("within 30 days
+    of the Effective Date") hang off an event the index does not know, so
+    they return None; see ``deadline_offset_days``.
+    """
+    if not text:
+        return None
+    m = _ISO.search(text)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3))).isoformat()
+        except ValueError:
+            pass
+    m = _SLASH.search(text)
+    if m:
+        try:
+            return date(int(m.group(3)), int(m.group(1)), int(m.group(2))).isoformat()
+        except ValueError:
+            pass
+    for candidate in _MONTH_DATE.findall(text):
+        candidate = candidate.replace(".", "")
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(candidate, fmt).date().isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+def deadline_offset_days(text: Optional[str]) -> Optional[int]:
+    """Approximate length in days of a relative deadline, or None if it is absolute or absent."""
+    if not text or normalize_deadline(text):
+        return None
+    m = _RELATIVE.search(text)
+    if not m:
+        return None
+    days = int(m.group(1)) * _UNIT_DAYS[m.group(3).lower()]
+    if m.group(2) and m.group(2).lower().startswith("business"):
+        days = days * 7 // 5
+    return days
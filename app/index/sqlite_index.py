@@ -0,0 +1,239 @@
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .base import CorpusIndex
+from .deadlines import deadline_offset_days, normalize_deadline
+
+EXCERPT_CHARS = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    analysed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_name ON documents(name);
+
+CREATE TABLE IF NOT EXISTS clauses (
+    clause_pk INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL REFERENCES documents(doc_id) ON DELETE CASCADE,
+    clause_no INTEGER NOT NULL,
+    clause_id TEXT,
+    page INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clauses_doc ON clauses(doc_id);
+
+CREATE TABLE IF NOT EXISTS risks (
+    clause_pk INTEGER NOT NULL REFERENCES clauses(clause_pk) ON DELETE CASCADE,
+    description TEXT,
+    severity TEXT,
+    category TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_risks_severity_category ON risks(severity, category);
+CREATE INDEX IF NOT EXISTS idx_risks_category ON risks(category);
+CREATE INDEX IF NOT EXISTS idx_risks_clause ON risks(clause_pk);
+
+CREATE TABLE IF NOT EXISTS obligations (
+    clause_pk INTEGER NOT NULL REFERENCES clauses(clause_pk) ON DELETE CASCADE,
+    actor TEXT,
+    actor_key TEXT,
+    action TEXT,
+    deadline TEXT,
+    due_date TEXT,
+    due_offset_days INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_obligations_actor_due ON obligations(actor_key, due_date);
+CREATE INDEX IF NOT EXISTS idx_obligations_due ON obligations(due_date);
+CREATE INDEX IF NOT EXISTS idx_obligations_clause ON obligations(clause_pk);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS clause_fts USING fts5(
+    text, content='clauses', content_rowid='clause_pk'
+);
+"""
+
+
+def _actor_key(actor: Optional[str]) -> Optional[str]:
+    return actor.strip().upper() if actor else None
+
+
+class SQLiteCorpusIndex(CorpusIndex):
+    """
+    Persistent index of analysed documents for cross-contract queries.
+
+    Clause text is searchable through FTS5; risks and obligations are kept in
+    B-tree indexed tables (severity/category, actor/due date). Only absolute
+    deadlines get a ``due_date``; relative ones ("within 30 days of notice")
+    are stored as ``due_offset_days`` and never matched as calendar dates.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(obligations)")}
+        if "due_offset_days" in columns:
+            return
+        # Older indexes resolved relative deadlines against the analysis date; recompute from the text.
+        with self.conn:
+            self.conn.execute("ALTER TABLE obligations ADD COLUMN due_offset_days INTEGER")
+            rows = self.conn.execute("SELECT rowid, deadline FROM obligations").fetchall()
+            self.conn.executemany(
+                "UPDATE obligations SET due_date = ?, due_offset_days = ? WHERE rowid = ?",
+                [(normalize_deadline(r["deadline"]), deadline_offset_days(r["deadline"]), r["rowid"]) for r in rows],
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _remove(self, name: str):
+        rows = self.conn.execute(
+            "SELECT c.clause_pk, c.text FROM clauses c JOIN documents d ON d.doc_id = c.doc_id WHERE d.name = ?",
+            (name,),
+        ).fetchall()
+        self.conn.executemany(
+            "INSERT INTO clause_fts(clause_fts, rowid, text) VALUES('delete', ?, ?)",
+            [(r["clause_pk"], r["text"]) for r in rows],
+        )
+        self.conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+
+    def remove_document(self, name: str):
+        with self.conn:
+            self._remove(name)
+
+    def add_document(self, name: str, results: Any, source: str = "", analysed_at: Optional[str] = None, replace: bool = True) -> int:
+        """Bulk-insert one analysed document (a ClauseTable) in a single transaction."""
+        analysed_at = analysed_at or datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            if replace:
+                self._remove(name)
+            cur = self.conn.execute(
+                "INSERT INTO documents(name, source, analysed_at) VALUES (?, ?, ?)",
+                (name, source, analysed_at),
+            )
+            doc_id = cur.lastrowid
+            first_pk = (self.conn.execute("SELECT COALESCE(MAX(clause_pk), 0) FROM clauses").fetchone()[0]) + 1
+            clause_rows = []
+            risk_rows = []
+            obligation_rows = []
+            for idx in range(len(results)):
+                pk = first_pk + idx
+                clause_rows.append((pk, doc_id, idx + 1, results.ids[idx], results.pages[idx], results.texts[idx] or ""))
+                for r in results.risks(idx):
+                    risk_rows.append((pk, r["description"], r["severity"], r["category"]))
+                for o in results.obligations(idx):
+                    obligation_rows.append((
+                        pk,
+                        o["actor"],
+                        _actor_key(o["actor"]),
+                        o["action"],
+                        o["deadline"],
+                        normalize_deadline(o["deadline"]),
+                        deadline_offset_days(o["deadline"]),
+                    ))
+            self.conn.executemany(
+                "INSERT INTO clauses(clause_pk, doc_id, clause_no, clause_id, page, text) VALUES (?, ?, ?, ?, ?, ?)",
+                clause_rows,
+            )
+            self.conn.executemany("INSERT INTO risks VALUES (?, ?, ?, ?)", risk_rows)
+            self.conn.executemany("INSERT INTO obligations VALUES (?, ?, ?, ?, ?, ?, ?)", obligation_rows)
+            self.conn.execute(
+                "INSERT INTO clause_fts(rowid, text) SELECT clause_pk, text FROM clauses WHERE doc_id = ?",
+                (doc_id,),
+            )
+        return doc_id
+
+    def _query(self, select: str, table: str, where: List[str], params: List[Any], text: Optional[str], order: str, limit: int) -> List[Dict[str, Any]]:
+        joins = f"FROM {table} t JOIN clauses c ON c.clause_pk = t.clause_pk JOIN documents d ON d.doc_id = c.doc_id"
+        if text:
+            joins += " JOIN clause_fts f ON f.rowid = c.clause_pk"
+            where.append("clause_fts MATCH ?")
+            params.append(text)
+        sql = (
+            f"SELECT {select}, d.name AS document, d.source AS source, c.clause_no AS clause, "
+            f"c.clause_id AS clause_id, c.page AS page, substr(c.text, 1, {EXCERPT_CHARS}) AS excerpt "
+            f"{joins}"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        try:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+        except sqlite3.OperationalError as e:
+            if text:
+                raise ValueError(f"Invalid text query {text!r}: {e}") from e
+            raise
+
+    def query_obligations(
+        self,
+        actor: Optional[str] = None,
+        due_within_days: Optional[int] = None,
+        due_before: Optional[str] = None,
+        due_after: Optional[str] = None,
+        offset_within_days: Optional[int] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter obligations by actor and due date.
+
+        ``due_*`` filters match absolute deadlines only. ``offset_within_days``
+        matches relative deadlines of at most that many days.
+        """
+        where, params = [], []
+        if actor:
+            where.append("t.actor_key = ?")
+            params.append(_actor_key(actor))
+        if due_within_days is not None:
+            today = date.today()
+            due_after = due_after or today.isoformat()
+            due_before = due_before or (today + timedelta(days=due_within_days)).isoformat()
+        if due_after:
+            where.append("t.due_date >= ?")
+            params.append(due_after)
+        if due_before:
+            where.append("t.due_date <= ?")
+            params.append(due_before)
+        if offset_within_days is not None:
+            where.append("t.due_offset_days <= ?")
+            params.append(offset_within_days)
+        return self._query(
+            "t.actor AS actor, t.action AS action, t.deadline AS deadline, t.due_date AS due_date, "
+            "t.due_offset_days AS due_offset_days",
+            "obligations", where, params, text, "t.due_date, t.rowid", limit,
+        )
+
+    def query_risks(
+        self,
+        severity: Optional[str] = None,
+        category: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        where, params = [], []
+        if severity:
+            where.append("t.severity = ?")
+            params.append(severity.lower())
+        if category:
+            where.append("t.category = ?")
+            params.append(category)
+        return self._query(
+            "t.description AS description, t.severity AS severity, t.category AS category",
+            "risks", where, params, text, "t.rowid", limit,
+        )
@@ -1 +1,8 @@
-from .pdf_ingestor import PDFIngestor
\ No newline at end of file
+__all__ = ["PDFIngestor"]
+
+
+def __getattr__(name):
+    if name == "PDFIngestor":
+        from .pdf_ingestor import PDFIngestor
+        return PDFIngestor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
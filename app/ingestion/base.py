@@ -1,7 +1,11 @@
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Union
+
+# A path, an in-memory buffer (bytes, bytearray, memoryview, mmap) or a binary file-like object.
+IngestSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
 
 class Ingestor(ABC):
     @abstractmethod
-    def ingest(self, file_path: str) -> List[Dict[str, Any]]:
-        pass
\ No newline at end of file
+    def ingest(self, source: IngestSource) -> List[Dict[str, Any]]:
+        pass
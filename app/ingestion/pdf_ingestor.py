@@ -1,20 +1,69 @@
-import fitz  # PyMuPDF
+import io
+import mmap
+import os
+from contextlib import contextmanager
 from typing import List, Dict, Any
-from .base import Ingestor
+from .base import Ingestor, IngestSource
 
 class PDFIngestor(Ingestor):
-    def ingest(self, file_path: str) -> List[Dict[str, Any]]:
-        document = fitz.open(file_path)
+    def __init__(self, use_mmap: bool = False):
+        # Memory-map local files instead of letting MuPDF read them through its own file stream.
+        self.use_mmap = use_mmap
+
+    @staticmethod
+    def _as_buffer(source) -> memoryview | bytes:
+        # PyMuPDF wraps bytes/memoryview without copying; everything else is turned into one.
+        if isinstance(source, (bytes, memoryview)):
+            return source
+        if isinstance(source, (bytearray, mmap.mmap)):
+            return memoryview(source)
+        if isinstance(source, io.BytesIO):
+            return source.getbuffer()
+        if hasattr(source, "getbuffer"):
+            return source.getbuffer()
+        if hasattr(source, "read"):
+            return source.read()
+        raise TypeError(f"Unsupported ingest source: {type(source).__name__}")
+
+    @contextmanager
+    def _open(self, source: IngestSource):
+        import fitz  # PyMuPDF
+
+        if isinstance(source, (str, os.PathLike)):
+            if not self.use_mmap:
+                document = fitz.open(source)
+                try:
+                    yield document
+                finally:
+                    document.close()
+                return
+            with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with self._open(mapped) as document:
+                    yield document
+            return
+
+        buffer = self._as_buffer(source)
+        document = fitz.open(stream=buffer, filetype="pdf")
+        try:
+            yield document
+        finally:
+            document.close()
+            del document
+            if isinstance(buffer, memoryview) and buffer is not source:
+                buffer.release()
+
+    def ingest(self, source: IngestSource) -> List[Dict[str, Any]]:
         clauses = []
-        for page_num in range(len(document)):
-            page = document.load_page(page_num)
-            text = page.get_text("text")
-            # Simple clause segmentation by splitting on double newlines
-            for i, clause_text in enumerate(text.split('\n\n')):
-                if clause_text.strip():
-                    clauses.append({
-                        "id": f"page_{page_num+1}_clause_{i+1}",
-                        "text": clause_text.strip(),
-                        "page": page_num + 1,
-                    })
-        return clauses
\ No newline at end of file
+        with self._open(source) as document:
+            for page_num in range(len(document)):
+                page = document.load_page(page_num)
+                text = page.get_text("text")
+                # Simple clause segmentation by splitting on double newlines
+                for i, clause_text in enumerate(text.split('\n\n')):
+                    if clause_text.strip():
+                        clauses.append({
+                            "id": f"page_{page_num+1}_clause_{i+1}",
+                            "text": clause_text.strip(),
+                            "page": page_num + 1,
+                        })
+        return clauses
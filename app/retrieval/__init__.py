@@ -1 +1,8 @@
-from .faiss_retriever import FaissRetriever
\ No newline at end of file
+__all__ = ["FaissRetriever"]
+
+
+def __getattr__(name):
+    if name == "FaissRetriever":
+        from .faiss_retriever import FaissRetriever
+        return FaissRetriever
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,8 @@
+__all__ = ["AnalysisService"]
+
+
+def __getattr__(name):
+    if name == "AnalysisService":
+        from .jobs import AnalysisService
+        return AnalysisService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,232 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from app.ingestion.pdf_ingestor import PDFIngestor
+from graph_pipeline.agents import get_rpm
+from graph_pipeline.graph import LegalAnalysisGraph
+from graph_pipeline.results import ClauseTable
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass
+class ServiceJob:
+    id: str
+    filename: str
+    data: Optional[bytes] = None
+    status: str = "queued"  # queued | running | done | failed
+    done: int = 0
+    total: int = 0
+    summary: str = ""
+    results: Optional[ClauseTable] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    ready: int = 0
+    finished_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"done", "failed"}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def publish(self, results: ClauseTable, ready: int):
+        """Expose clauses ``[0, ready)`` of ``results`` to result streams."""
+        self.results = results
+        self.ready = ready
+        self._notify()
+
+    def finish(self):
+        self.finished_at = time.time()
+        self.ready = self.results.analysed if self.results is not None else 0
+        self.finished_event.set()
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def stream_results(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield analysed clauses as batches finish, until the job ends."""
+        sent = 0
+        while True:
+            changed = self._changed
+            if self.results is not None and self.ready > sent:
+                stop = self.ready
+                for item in self.results.analysis(sent, stop):
+                    yield item
+                sent = stop
+                continue
+            if self.finished:
+                return
+            await changed.wait()
+
+
+class LatencyWindow:
+    def __init__(self, size: int = 1000):
+        self._values: Deque[float] = deque(maxlen=size)
+
+    def add(self, value: float):
+        self._values.append(value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._values:
+            return None
+        values = sorted(self._values)
+        k = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+        return values[k]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {"count": len(self._values), "p50": self.percentile(50), "p95": self.percentile(95), "max": self.percentile(100)}
+
+
+class AnalysisService:
+    """
+    Bounded job queue drained by a fixed pool of async workers.
+
+    All workers share one LegalAnalysisGraph, and therefore one LLMRouter
+    with its pool of ChatBot clients and per-endpoint RPM quotas.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        queue_size: int = 16,
+        max_retained_jobs: int = 256,
+        analysis_model: Optional[str] = None,
+        summary_model: Optional[str] = None,
+        budget_seconds: Optional[float] = None,
+    ):
+        self.worker_count = workers
+        self.budget_seconds = budget_seconds
+        self.max_retained_jobs = max_retained_jobs
+        self.graph = LegalAnalysisGraph(analysis_model=analysis_model, summary_model=summary_model)
+        self.queue: "asyncio.Queue[ServiceJob]" = asyncio.Queue(maxsize=queue_size)
+        self.jobs: "OrderedDict[str, ServiceJob]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait = LatencyWindow()
+        self.run_latency = LatencyWindow()
+
+    async def start(self):
+        for i in range(self.worker_count):
+            self._workers.append(asyncio.create_task(self._worker(), name=f"analysis-worker-{i}"))
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        # Jobs still queued will never run; end their result streams too.
+        while not self.queue.empty():
+            job = self.queue.get_nowait()
+            job.status = "failed"
+            job.error = "Service shutting down"
+            job.data = None
+            self.failed += 1
+            job.finish()
+            self.queue.task_done()
+
+    def submit(self, data: bytes, filename: str = "") -> ServiceJob:
+        job = ServiceJob(id=uuid.uuid4().hex, filename=filename, data=data)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"Job queue is full ({self.queue.maxsize} pending)")
+        self.jobs[job.id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[ServiceJob]:
+        return self.jobs.get(job_id)
+
+    def _evict_finished(self):
+        while len(self.jobs) > self.max_retained_jobs:
+            victim = next((k for k, j in self.jobs.items() if j.finished), None)
+            if victim is None:
+                break
+            del self.jobs[victim]
+
+    @staticmethod
+    def _ingest(data: bytes) -> List[Dict[str, Any]]:
+        return PDFIngestor().ingest(data)
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            self.in_flight += 1
+            job.status = "running"
+            job.started_at = time.time()
+            self.queue_wait.add(job.started_at - job.submitted_at)
+
+            def on_progress(done: int, total: int, job=job):
+                job.done = done
+                job.total = total
+
+            try:
+                items = await asyncio.to_thread(self._ingest, job.data)
+                job.total = len(items)
+                final_state = await self.graph.run(
+                    clause_items=items,
+                    on_progress=on_progress,
+                    on_batch=lambda table, start, stop, job=job: job.publish(table, stop),
+                    budget_seconds=self.budget_seconds,
+                )
+                job.summary = final_state.get("summary", "")
+                job.results = final_state.get("results")
+                job.status = "done"
+                self.completed += 1
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "Service shutting down"
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.failed += 1
+            finally:
+                job.data = None
+                job.finish()
+                self.run_latency.add(job.finished_at - job.started_at)
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "workers": self.worker_count,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.summary(),
+            "run_latency_seconds": self.run_latency.summary(),
+            "llm_rpm": get_rpm(),
+            "llm_rpm_capacity": self.graph.router.capacity(),
+            "llm_endpoints": self.graph.router.report(),
+        }
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+
+from app.service.jobs import AnalysisService, QueueFullError
+
+load_dotenv()
+
+
+def create_app(
+    workers: int = 2,
+    queue_size: int = 16,
+    analysis_model: str | None = None,
+    summary_model: str | None = None,
+    budget_seconds: float | None = None,
+) -> FastAPI:
+    service = AnalysisService(
+        workers=workers,
+        queue_size=queue_size,
+        analysis_model=analysis_model,
+        summary_model=summary_model,
+        budget_seconds=budget_seconds,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await service.start()
+        yield
+        await service.stop()
+
+    app = FastAPI(title="Legal Analysis Service", lifespan=lifespan)
+    app.state.service = service
+
+    def get_job(job_id: str):
+        job = service.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(file: UploadFile = File(...)):
+        data = await file.read()
+        if not data:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        try:
+            job = service.submit(data, filename=file.filename or "")
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        return get_job(job_id).to_dict()
+
+    @app.get("/jobs/{job_id}/results")
+    async def job_results(job_id: str):
+        job = get_job(job_id)
+
+        async def stream():
+            yield json.dumps({"type": "job", **job.to_dict()}) + "\n"
+            async for item in job.stream_results():
+                yield json.dumps({"type": "clause", **item}) + "\n"
+            # Final status once the job has ended, then the summary if it succeeded.
+            yield json.dumps({"type": "job", **job.to_dict()}) + "\n"
+            if job.status == "done":
+                yield json.dumps({"type": "summary", "summary": job.summary}) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    @app.get("/metrics")
+    async def metrics():
+        return service.metrics()
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the legal analysis HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ANALYSIS_WORKERS", "2")), help="Number of concurrent analysis workers.")
+    parser.add_argument("--queue-size", type=int, default=int(os.getenv("ANALYSIS_QUEUE_SIZE", "16")), help="Maximum pending jobs before submissions get 429.")
+    parser.add_argument("--analysis-model", default=None, help="LLM model for clause analysis (e.g., gemini-2.5-pro)")
+    parser.add_argument("--summary-model", default=None, help="LLM model for summary (e.g., gemini-2.5-pro)")
+    parser.add_argument("--budget", type=float, default=None, help="Per-document latency budget in seconds.")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        analysis_model=args.analysis_model,
+        summary_model=args.summary_model,
+        budget_seconds=args.budget,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,8 @@
-from .gemini_summarizer import GeminiSummarizer
\ No newline at end of file
+__all__ = ["GeminiSummarizer"]
+
+
+def __getattr__(name):
+    if name == "GeminiSummarizer":
+        from .gemini_summarizer import GeminiSummarizer
+        return GeminiSummarizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.ingestion.pdf_ingestor import PDFIngestor
+from graph_pipeline.graph import LegalAnalysisGraph
+from graph_pipeline.router import LLMRouter
+from graph_pipeline.results import ClauseTable, load_run, save_run
+
+
+@dataclass
+class AnalysisJob:
+    key: str
+    model: str
+    status: str = "queued"  # queued | running | done | failed
+    done: int = 0
+    total: int = 0
+    summary: str = ""
+    results: Optional[ClauseTable] = None
+    error: Optional[str] = None
+    degraded: List[str] = field(default_factory=list)
+    submitted_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"done", "failed"}
+
+
+class AnalysisJobs:
+    """
+    Runs document analyses on a background event loop so they outlive
+    Streamlit reruns.
+
+    Jobs are keyed by (file hash, model). Finished results are written to
+    ``cache_dir`` so re-uploading a known file is served without calling the
+    pipeline again; only the ``max_retained_jobs`` most recently used jobs stay
+    in memory, older ones are reloaded from disk on demand. Degraded runs
+    (local fallbacks after provider errors, rate limits or an exhausted
+    budget) are never cached and are re-run on the next submission.
+
+    Jobs on the same API key share one LLMRouter, so concurrent analyses
+    split that key's RPM quota instead of each assuming all of it.
+    """
+
+    def __init__(self, cache_dir: str, max_workers: int = 2, max_retained_jobs: int = 32):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_retained_jobs = max_retained_jobs
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._routers: Dict[str, LLMRouter] = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._slots = asyncio.Semaphore(max_workers)
+        threading.Thread(target=self._loop.run_forever, name="analysis-loop", daemon=True).start()
+
+    @staticmethod
+    def job_key(data: bytes, model: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest}-{model}"
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, key: str, model: str) -> Optional[AnalysisJob]:
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            summary, results = load_run(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return AnalysisJob(
+            key=key,
+            model=model,
+            status="done",
+            done=len(results),
+            total=len(results),
+            summary=summary,
+            results=results,
+            submitted_at=time.time(),
+            finished_at=time.time(),
+        )
+
+    def _store_cached(self, job: AnalysisJob):
+        save_run(self._cache_path(job.key), job.summary, job.results)
+
+    def _retain(self, job: AnalysisJob):
+        self._jobs[job.key] = job
+        self._jobs.move_to_end(job.key)
+        while len(self._jobs) > self.max_retained_jobs:
+            victim = next((k for k, j in self._jobs.items() if j.finished), None)
+            if victim is None:
+                break
+            del self._jobs[victim]
+
+    def get(self, key: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._load_cached(key, key.partition("-")[2])
+                if job is None:
+                    return None
+            self._retain(job)
+            return job
+
+    def submit(self, data: bytes, model: str, api_key: str) -> AnalysisJob:
+        key = self.job_key(data, model)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != "failed" and not job.degraded:
+                self._retain(job)
+                return job
+            job = self._load_cached(key, model)
+            if job is None:
+                job = AnalysisJob(key=key, model=model, submitted_at=time.time())
+                asyncio.run_coroutine_threadsafe(self._run(job, data, api_key), self._loop)
+            self._retain(job)
+        return job
+
+    def _router(self, api_key: str) -> LLMRouter:
+        # Only touched from the analysis loop, so no locking is needed.
+        return self._routers.setdefault(api_key, LLMRouter([]))
+
+    async def _run(self, job: AnalysisJob, data: bytes, api_key: str):
+        def on_progress(done: int, total: int):
+            job.done = done
+            job.total = total
+
+        try:
+            async with self._slots:
+                job.status = "running"
+                items = await asyncio.to_thread(PDFIngestor().ingest, data)
+                job.total = len(items)
+                graph = LegalAnalysisGraph(
+                    analysis_model=job.model,
+                    summary_model=job.model,
+                    api_key=api_key,
+                    router=self._router(api_key),
+                )
+                final_state: Dict[str, Any] = await graph.run(clause_items=items, on_progress=on_progress)
+            job.summary = final_state.get("summary", "")
+            job.results = final_state.get("results")
+            job.degraded = final_state.get("degraded") or []
+            if not job.degraded:
+                await asyncio.to_thread(self._store_cached, job)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
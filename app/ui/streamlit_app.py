@@ -1,12 +1,29 @@
 import os
 import sys
-import tempfile
+import time
 import streamlit as st
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from app.ingestion.pdf_ingestor import PDFIngestor
-from graph_pipeline.graph import LegalAnalysisGraph
+from app.ui.jobs import AnalysisJobs
+from app.ui.views import (
+    OBLIGATION_COLUMNS,
+    RISK_COLUMNS,
+    filter_frame,
+    obligation_frame,
+    page_bounds,
+    page_count,
+    risk_frame,
+    sort_obligations,
+    sort_risks,
+    visible_slice,
+)
+
+CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "legal-analyzer"))
+MAX_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+POLL_SECONDS = 1.0
+PAGE_SIZE = 50
+EXPLORER_PAGE_SIZE = 20
 
 st.set_page_config(page_title="Legal Analyzer", page_icon="📄", layout="centered")
 
@@ -40,9 +57,26 @@ with st.sidebar:
 uploaded_file = st.file_uploader("Upload PDF", type=["pdf"], accept_multiple_files=False)
 analyze = st.button("Analyze", type="primary")
 
-def severity_rank(val):
-    order = {"high": 3, "medium": 2, "low": 1}
-    return order.get((val or "").lower(), 0)
+@st.cache_resource
+def get_jobs() -> AnalysisJobs:
+    return AnalysisJobs(cache_dir=CACHE_DIR, max_workers=MAX_WORKERS)
+
+@st.cache_data(max_entries=16)
+def cached_risk_frame(job_key, finished_at, _results):
+    return risk_frame(_results)
+
+@st.cache_data(max_entries=16)
+def cached_obligation_frame(job_key, finished_at, _results):
+    return obligation_frame(_results)
+
+def pager(name, total, page_size=PAGE_SIZE):
+    pages = page_count(total, page_size)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{name}_page")
+    start, stop = page_bounds(total, page, page_size)
+    st.caption(f"Showing {start + 1 if total else 0}–{stop} of {total}")
+    return int(page)
+
+jobs = get_jobs()
 
 if analyze:
     if not api_key:
@@ -50,115 +84,89 @@ if analyze:
     elif not uploaded_file:
         st.error("Please upload a PDF document")
     else:
-        os.environ["GEMINI_API_KEY"] = api_key
-        os.environ["GEMINI_MODEL_ANALYSIS"] = model_choice
-        os.environ["GEMINI_MODEL_SUMMARY"] = model_choice
         os.environ["GEMINI_FALLBACK_ON_429"] = "true"
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tmp.write(uploaded_file.read())
-        tmp.flush()
-        tmp.close()
-        with st.spinner("Analyzing document…"):
-            ingestor = PDFIngestor()
-            items = ingestor.ingest(tmp.name)
-            graph = LegalAnalysisGraph()
-            import asyncio
-            final_state = asyncio.run(graph.run(clause_items=items))
-        os.unlink(tmp.name)
-        summary = final_state.get("summary", "")
-        analysis = final_state.get("analysis", [])
-        st.subheader("Analysis Results")
-        summary_tab, risks_tab, obligations_tab, explorer_tab = st.tabs(["Executive Summary", "Key Risks", "Obligations Register", "Clause Explorer"])
-
-        with summary_tab:
-            st.markdown(f"<div class='card'>{summary}</div>", unsafe_allow_html=True)
-
-        risk_rows = []
-        obligation_rows = []
-        for item in analysis:
+        job = jobs.submit(uploaded_file.getvalue(), model_choice, api_key)
+        st.session_state["job_key"] = job.key
+
+job_key = st.session_state.get("job_key")
+job = jobs.get(job_key) if job_key else None
+
+if job is not None and not job.finished:
+    total = job.total or 1
+    label = f"Analyzing document… {job.done}/{job.total} clauses" if job.total else "Analyzing document…"
+    st.progress(min(job.done / total, 1.0), text=label)
+    time.sleep(POLL_SECONDS)
+    st.rerun()
+elif job is not None and job.status == "failed":
+    st.error(f"Analysis failed: {job.error}")
+elif job is not None:
+    summary = job.summary
+    results = job.results
+    st.subheader("Analysis Results")
+    if job.degraded:
+        st.warning("Some results came from a fallback model or local heuristics because the selected model was unavailable; they were not cached. Run the analysis again to retry.")
+    summary_tab, risks_tab, obligations_tab, explorer_tab = st.tabs(["Executive Summary", "Key Risks", "Obligations Register", "Clause Explorer"])
+
+    with summary_tab:
+        st.markdown(f"<div class='card'>{summary}</div>", unsafe_allow_html=True)
+
+    risks_df = cached_risk_frame(job.key, job.finished_at, results)
+    obligations_df = cached_obligation_frame(job.key, job.finished_at, results)
+
+    with risks_tab:
+        f1, f2 = st.columns(2)
+        with f1:
+            categories = st.multiselect("Category", options=sorted(c for c in risks_df["category"].cat.categories if c), key="risk_categories")
+        with f2:
+            severities = st.multiselect("Severity", options=["high", "medium", "low"], key="risk_severities")
+        view = filter_frame(risks_df, "category", categories)
+        view = filter_frame(view, "severity", severities)
+        view = sort_risks(view)
+        page = pager("risks", len(view))
+        st.dataframe(
+            visible_slice(view, page, PAGE_SIZE)[RISK_COLUMNS],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    with obligations_tab:
+        actors = st.multiselect("Actor", options=sorted(a for a in obligations_df["actor"].cat.categories if a), key="obligation_actors")
+        view = sort_obligations(filter_frame(obligations_df, "actor", actors))
+        page = pager("obligations", len(view))
+        st.dataframe(
+            visible_slice(view, page, PAGE_SIZE)[OBLIGATION_COLUMNS],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    with explorer_tab:
+        total_clauses = len(results) if results is not None else 0
+        clause_page = pager("clauses", total_clauses, page_size=EXPLORER_PAGE_SIZE)
+        start, stop = page_bounds(total_clauses, clause_page, EXPLORER_PAGE_SIZE)
+        for item in (results.analysis(start, stop) if results is not None else []):
             page = item.get("page")
             idx = item.get("index")
-            for r in item.get("risks") or []:
-                risk_rows.append({
-                    "severity": (r.get("severity") or "").lower(),
-                    "description": r.get("description"),
-                    "category": r.get("category"),
-                    "page": page,
-                    "clause": idx,
-                })
-            for o in item.get("obligations") or []:
-                obligation_rows.append({
-                    "actor": o.get("actor"),
-                    "action": o.get("action"),
-                    "deadline": o.get("deadline"),
-                    "page": page,
-                    "clause": idx,
-                })
-        risk_rows.sort(key=lambda r: (-severity_rank(r["severity"]), r["page"] or 0))
-        obligation_rows.sort(key=lambda o: (o["page"] or 0))
-        with risks_tab:
-            cols = st.columns(2)
-            with cols[0]:
-                for r in risk_rows[:5]:
-                    sev = r["severity"] or "low"
-                    sev_cls = "high" if sev == "high" else "medium" if sev == "medium" else "low"
-                    badge = f"<span class='badge {sev_cls}'>{sev.capitalize()}</span>"
-                    st.markdown(
-                        f"<div class='card'>{badge} {r['description']}<div class='muted'>Page {r['page']} • Clause {r['clause']} • {r['category']}</div></div>",
-                        unsafe_allow_html=True,
-                    )
-            with cols[1]:
-                if len(risk_rows) > 5:
-                    for r in risk_rows[5:10]:
-                        sev = r["severity"] or "low"
+            excerpt = item.get("clause_excerpt")
+            with st.expander(f"Clause {idx} (Page {page})"):
+                st.write(excerpt)
+                rs = item.get("risks") or []
+                os_ = item.get("obligations") or []
+                if rs:
+                    for r in rs:
+                        sev = (r.get("severity") or "low").lower()
                         sev_cls = "high" if sev == "high" else "medium" if sev == "medium" else "low"
                         badge = f"<span class='badge {sev_cls}'>{sev.capitalize()}</span>"
                         st.markdown(
-                            f"<div class='card'>{badge} {r['description']}<div class='muted'>Page {r['page']} • Clause {r['clause']} • {r['category']}</div></div>",
+                            f"<div class='card'>{badge} {r.get('description')}<div class='muted'>{r.get('category')}</div></div>",
                             unsafe_allow_html=True,
                         )
-
-        with obligations_tab:
-            cols2 = st.columns(2)
-            with cols2[0]:
-                for o in obligation_rows[:5]:
-                    st.markdown(
-                        f"<div class='card'><span class='badge pill'>Obligation</span> {o['actor'] or 'Actor'} – {o['action']}<div class='muted'>Page {o['page']} • Clause {o['clause']} • Deadline: {o['deadline'] or 'N/A'}</div></div>",
-                        unsafe_allow_html=True,
-                    )
-            with cols2[1]:
-                if len(obligation_rows) > 5:
-                    for o in obligation_rows[5:10]:
+                else:
+                    st.markdown("<div class='muted'>No risks</div>", unsafe_allow_html=True)
+                if os_:
+                    for o in os_:
                         st.markdown(
-                            f"<div class='card'><span class='badge pill'>Obligation</span> {o['actor'] or 'Actor'} – {o['action']}<div class='muted'>Page {o['page']} • Clause {o['clause']} • Deadline: {o['deadline'] or 'N/A'}</div></div>",
+                            f"<div class='card'><span class='badge pill'>Obligation</span> {o.get('actor') or 'Actor'} – {o.get('action')}<div class='muted'>Deadline: {o.get('deadline') or 'N/A'}</div></div>",
                             unsafe_allow_html=True,
                         )
-
-        with explorer_tab:
-            for item in analysis:
-                page = item.get("page")
-                idx = item.get("index")
-                excerpt = item.get("clause_excerpt")
-                with st.expander(f"Clause {idx} (Page {page})"):
-                    st.write(excerpt)
-                    rs = item.get("risks") or []
-                    os_ = item.get("obligations") or []
-                    if rs:
-                        for r in rs:
-                            sev = (r.get("severity") or "low").lower()
-                            sev_cls = "high" if sev == "high" else "medium" if sev == "medium" else "low"
-                            badge = f"<span class='badge {sev_cls}'>{sev.capitalize()}</span>"
-                            st.markdown(
-                                f"<div class='card'>{badge} {r.get('description')}<div class='muted'>{r.get('category')}</div></div>",
-                                unsafe_allow_html=True,
-                            )
-                    else:
-                        st.markdown("<div class='muted'>No risks</div>", unsafe_allow_html=True)
-                    if os_:
-                        for o in os_:
-                            st.markdown(
-                                f"<div class='card'><span class='badge pill'>Obligation</span> {o.get('actor') or 'Actor'} – {o.get('action')}<div class='muted'>Deadline: {o.get('deadline') or 'N/A'}</div></div>",
-                                unsafe_allow_html=True,
-                            )
-                    else:
-                        st.markdown("<div class='muted'>No obligations</div>", unsafe_allow_html=True)
\ No newline at end of file
+                else:
+                    st.markdown("<div class='muted'>No obligations</div>", unsafe_allow_html=True)
@@ -0,0 +1,57 @@
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from graph_pipeline.results import ClauseTable
+
+SEVERITY_ORDER = {"high": 3, "medium": 2, "low": 1}
+
+RISK_COLUMNS = ["severity", "description", "category", "page", "clause"]
+OBLIGATION_COLUMNS = ["actor", "action", "deadline", "page", "clause"]
+
+
+def risk_frame(results: Optional[ClauseTable]) -> pd.DataFrame:
+    rows = list(results.risk_rows()) if results is not None else []
+    df = pd.DataFrame.from_records(rows, columns=RISK_COLUMNS)
+    df["severity"] = df["severity"].fillna("")
+    df["_rank"] = df["severity"].map(SEVERITY_ORDER).fillna(0)
+    df["severity"] = df["severity"].astype("category")
+    df["category"] = df["category"].astype("category")
+    return df
+
+
+def obligation_frame(results: Optional[ClauseTable]) -> pd.DataFrame:
+    rows = list(results.obligation_rows()) if results is not None else []
+    df = pd.DataFrame.from_records(rows, columns=OBLIGATION_COLUMNS)
+    df["actor"] = df["actor"].astype("category")
+    return df
+
+
+def filter_frame(df: pd.DataFrame, column: str, values: Iterable[str]) -> pd.DataFrame:
+    values = list(values)
+    if not values:
+        return df
+    return df[df[column].isin(values)]
+
+
+def sort_risks(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["_rank", "page", "clause"], ascending=[False, True, True], na_position="last", kind="stable")
+
+
+def sort_obligations(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["page", "clause"], na_position="last", kind="stable")
+
+
+def page_count(total: int, page_size: int) -> int:
+    return max((total + page_size - 1) // page_size, 1)
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int]:
+    page = min(max(page, 1), page_count(total, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def visible_slice(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    start, stop = page_bounds(len(df), page, page_size)
+    return df.iloc[start:stop]
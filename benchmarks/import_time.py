@@ -0,0 +1,83 @@
+"""
+Check cold-start import cost of the CLI and package entry points.
+
+    python benchmarks/import_time.py [--scale 2.0]
+
+Each module is imported in a fresh interpreter under ``-X importtime``.
+The check fails (exit code 1) when a module exceeds its time budget or
+pulls in a heavy dependency that should only load on first use.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY = ("faiss", "sentence_transformers", "torch", "spoon_ai", "fitz", "pymupdf", "fastapi", "pyarrow")
+
+# module -> cumulative import budget in milliseconds
+BUDGETS = {
+    "main": 150,
+    "graph_pipeline.main": 150,
+    "app.ingestion": 50,
+    "app.retrieval": 50,
+    "app.summarization": 50,
+    "app.service": 50,
+    "app.export": 50,
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+
+def measure(module: str):
+    probe = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match and match.group(3).strip() == module:
+            cumulative_us = int(match.group(2))
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (for slow machines).")
+    args = parser.parse_args()
+
+    failures = 0
+    for module, budget_ms in BUDGETS.items():
+        budget_ms *= args.scale
+        try:
+            elapsed_ms, heavy = measure(module)
+        except RuntimeError as e:
+            print(f"FAIL {module}: {e}")
+            failures += 1
+            continue
+        problems = []
+        if elapsed_ms > budget_ms:
+            problems.append(f"{elapsed_ms:.1f} ms > {budget_ms:.0f} ms budget")
+        if heavy:
+            problems.append(f"eagerly imports {', '.join(heavy)}")
+        status = "FAIL" if problems else "ok  "
+        detail = "; ".join(problems) if problems else f"{elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)"
+        print(f"{status} {module}: {detail}")
+        failures += bool(problems)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
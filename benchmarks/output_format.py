@@ -0,0 +1,100 @@
+"""
+Compare verbose vs compact batch-analysis output on a corpus of PDFs.
+
+    python benchmarks/output_format.py --corpus data --model gemini-2.0-flash
+
+Reports, per output format, the number of batch calls, mean response size
+(characters and estimated tokens at ~4 chars/token), call latency
+percentiles and local decode time.
+"""
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+from app.ingestion.pdf_ingestor import PDFIngestor
+from graph_pipeline.agents import ComprehensiveClauseAnalyserAgent
+from graph_pipeline.compact import decode_compact
+from spoon_ai.chat import ChatBot
+
+load_dotenv()
+
+BATCH_SIZE = 20
+CHARS_PER_TOKEN = 4
+
+
+class MeasuredAnalyser(ComprehensiveClauseAnalyserAgent):
+    samples: list = []
+
+    async def _execute_with_retry(self, prompt):
+        started = time.perf_counter()
+        response = await super()._execute_with_retry(prompt)
+        self.samples.append((time.perf_counter() - started, len(response or "")))
+        return response
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)]
+
+
+async def run_format(llm, batches, compact: bool):
+    agent = MeasuredAnalyser(llm=llm, compact=compact)
+    agent.samples = []
+    for batch in batches:
+        await agent.execute(batch)
+    return agent.samples
+
+
+def decode_time(rounds: int = 200) -> float:
+    sample = '[[1,[["Uncapped liability for data loss","h","li"]],[["SUPPLIER","Deliver goods","30 days"]]],[3,[],[["CLIENT","Pay invoices",null]]]]'
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode_compact(sample, BATCH_SIZE)
+    return (time.perf_counter() - started) / rounds
+
+
+def report(name, samples):
+    if not samples:
+        print(f"{name}: no calls")
+        return
+    latencies = [s[0] for s in samples]
+    sizes = [s[1] for s in samples]
+    mean_chars = statistics.mean(sizes)
+    print(
+        f"{name:8s} calls={len(samples):4d} "
+        f"out_chars={mean_chars:8.0f} out_tokens~{mean_chars / CHARS_PER_TOKEN:7.0f} "
+        f"p50={percentile(latencies, 50):6.2f}s p95={percentile(latencies, 95):6.2f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default="data", help="Directory of PDF files.")
+    parser.add_argument("--model", default=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite"))
+    parser.add_argument("--max-batches", type=int, default=10, help="Batches per format (limits API usage).")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.corpus}")
+    ingestor = PDFIngestor()
+    texts = [item["text"] for path in paths for item in ingestor.ingest(path)]
+    batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)][:args.max_batches]
+
+    llm = ChatBot(llm_provider="gemini", api_key=os.getenv("GEMINI_API_KEY"), model_name=args.model)
+    print(f"{len(paths)} documents, {len(batches)} batches of up to {BATCH_SIZE} clauses, model {args.model}")
+    report("verbose", await run_format(llm, batches, compact=False))
+    report("compact", await run_format(llm, batches, compact=True))
+    print(f"compact decode: {decode_time() * 1e6:.1f} µs per batch")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
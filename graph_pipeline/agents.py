@@ -1,13 +1,32 @@
 from spoon_ai.agents.base import BaseAgent
 import os
 import json
-import asyncio
 import time
 import re
+import asyncio
 from collections import deque
+from contextvars import ContextVar
+from typing import Dict, Optional, Set
 from spoon_ai.llm.errors import RateLimitError
+from .router import Endpoint, LLMRouter
+from .compact import compact_batch_prompt, decode_compact
+from .deadlines import DeadlineExceeded, LatencyTracker, backoff_delay, current_deadline
 
 _call_times = deque()
+_latencies = LatencyTracker()
+_degradations: ContextVar[Optional[Set[str]]] = ContextVar("degradations", default=None)
+
+def record_degradation(reason: str):
+    """Note that part of the current run fell back to a local or empty answer."""
+    reasons = _degradations.get()
+    if reasons is not None:
+        reasons.add(reason)
+
+def collect_degradations(reasons: Set[str]):
+    return _degradations.set(reasons)
+
+def reset_degradations(token):
+    _degradations.reset(token)
 
 def _record_call():
     now = time.time()
@@ -21,8 +40,8 @@ def get_rpm():
     cutoff = now - 60
     return sum(1 for t in _call_times if t >= cutoff)
 
-def get_rpm_limit():
-    model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite").lower()
+def get_rpm_limit(model: str | None = None):
+    model = (model or os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")).lower()
     if "pro" in model:
         return 5
     if "flash-lite" in model:
@@ -31,38 +50,140 @@ def get_rpm_limit():
         return 10
     return 10
 
+def get_fallback_model(model: str) -> str:
+    fallback_model = os.getenv("GEMINI_FALLBACK_MODEL", "")
+    if fallback_model:
+        return fallback_model
+    if "pro" in model:
+        return "gemini-2.0-flash"
+    if "flash-lite" in model:
+        return "gemini-2.0-flash"
+    return "gemini-2.0-flash-lite"
+
+def compact_output_enabled() -> bool:
+    return os.getenv("GEMINI_COMPACT_OUTPUT", "false").lower() in {"true", "1", "yes"}
+
+def get_max_retries() -> int:
+    return int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+
+def get_call_timeout() -> Optional[float]:
+    # Unset means calls are bounded only by the run's latency budget, if any.
+    value = os.getenv("GEMINI_CALL_TIMEOUT")
+    return float(value) if value else None
+
+def hedging_enabled() -> bool:
+    return os.getenv("GEMINI_HEDGE_REQUESTS", "false").lower() in {"true", "1", "yes"}
+
+def fallback_enabled() -> bool:
+    return os.getenv("GEMINI_FALLBACK_ON_429", "false").lower() in {"true", "1", "yes"}
+
 class CustomBaseAgent(BaseAgent):
-    async def _execute_with_retry(self, prompt):
-        max_retries = 0
-        retries = 0
+    router: Optional[LLMRouter] = None
+    preferences: Dict[str, float] = {}
+
+    def _ensure_router(self) -> LLMRouter:
+        if self.router is None:
+            model = getattr(self.llm, "model_name", "") or os.getenv("GEMINI_MODEL", "")
+            endpoint = Endpoint(getattr(self.llm, "api_key", "") or "", model, get_rpm_limit(model), lambda key, m: self.llm)
+            self.router = LLMRouter([endpoint])
+            self.preferences = {model: 1.0}
+        return self.router
+
+    async def _ask(self, endpoint: Endpoint, prompt):
+        router = self._ensure_router()
+        _record_call()
+        started = time.monotonic()
+        try:
+            response = await endpoint.client.ask(messages=[{"role": "user", "content": prompt}])
+        except RateLimitError as e:
+            router.record_rate_limit(endpoint, getattr(e, "retry_after", None))
+            raise
+        except Exception:
+            router.record_failure(endpoint)
+            raise
+        latency = time.monotonic() - started
+        router.record_success(endpoint, latency)
+        _latencies.add(endpoint.model, latency)
+        if self.preferences.get(endpoint.model, 0) < max(self.preferences.values(), default=0):
+            record_degradation("fallback_model")
+        return response
+
+    async def _ask_hedged(self, endpoint: Endpoint, prompt, timeout):
+        # Send a duplicate to another endpoint if the first call outlives the model's p95.
+        p95 = _latencies.p95(endpoint.model) if hedging_enabled() else None
+        if p95 is None or (timeout is not None and p95 >= timeout):
+            return await asyncio.wait_for(self._ask(endpoint, prompt), timeout)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self._ask(endpoint, prompt))
+        done, _ = await asyncio.wait({primary}, timeout=p95)
+        if done:
+            return primary.result()
+        hedge_endpoint = self._ensure_router().try_acquire(self.preferences, exclude={endpoint})
+        tasks = {primary}
+        if hedge_endpoint is not None:
+            tasks.add(asyncio.ensure_future(self._ask(hedge_endpoint, prompt)))
+        remaining = None if timeout is None else max(timeout - (time.monotonic() - started), 0)
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not tasks:
+                    raise done.pop().exception()
+                remaining = None if timeout is None else max(timeout - (time.monotonic() - started), 0)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _execute_with_retry(self, prompt, retry_timeouts: bool = True):
+        router = self._ensure_router()
+        deadline = current_deadline()
+        max_retries = get_max_retries()
+        attempt = 0
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        retry_after = None
 
         while True:
+            if deadline.expired:
+                raise DeadlineExceeded("Analysis latency budget exhausted")
+            try:
+                endpoint = await asyncio.wait_for(router.acquire(self.preferences, exclude=tried), deadline.call_timeout(None))
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Analysis latency budget exhausted while waiting for LLM capacity")
+
+            if endpoint is None:
+                # Every endpoint has rate-limited this request: back off, then try them again.
+                if attempt >= max_retries:
+                    raise last_error or RateLimitError(provider="gemini")
+                delay = backoff_delay(attempt, retry_after)
+                if delay >= deadline.remaining():
+                    raise last_error or DeadlineExceeded("Analysis latency budget exhausted")
+                await asyncio.sleep(delay)
+                attempt += 1
+                tried.clear()
+                continue
+
             try:
-                while get_rpm() >= get_rpm_limit():
-                    await asyncio.sleep(1)
-                _record_call()
-                return await self.llm.ask(messages=[{"role": "user", "content": prompt}])
+                return await self._ask_hedged(endpoint, prompt, deadline.call_timeout(get_call_timeout()))
             except RateLimitError as e:
-                fallback_flag = os.getenv("GEMINI_FALLBACK_ON_429", "false").lower() in {"true", "1", "yes"}
-                if fallback_flag:
-                    current = getattr(self.llm, "model_name", "") or os.getenv("GEMINI_MODEL", "")
-                    fallback_model = os.getenv("GEMINI_FALLBACK_MODEL", "")
-                    if not fallback_model:
-                        if "pro" in current:
-                            fallback_model = "gemini-2.0-flash"
-                        elif "flash-lite" in current:
-                            fallback_model = "gemini-2.0-flash"
-                        else:
-                            fallback_model = "gemini-2.0-flash-lite"
-                    try:
-                        self.llm._update_provider_config(provider=self.llm.llm_provider, model_name=fallback_model)
-                        _record_call()
-                        return await self.llm.ask(messages=[{"role": "user", "content": prompt}])
-                    except RateLimitError:
-                        pass
-                retries += 1
-                if retries >= max_retries:
-                    raise e
+                # Cool down this endpoint only and reroute this request.
+                tried.add(endpoint)
+                last_error = e
+                retry_after = getattr(e, "retry_after", None)
+            except asyncio.TimeoutError as e:
+                last_error = e
+                if not retry_timeouts or attempt >= max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                if delay >= deadline.remaining():
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
 
 class ClauseExtractionAgent(BaseAgent):
     def __init__(self, llm):
@@ -82,10 +203,25 @@ class ClauseExtractionAgent(BaseAgent):
         return clauses
 
 class ComprehensiveClauseAnalyserAgent(CustomBaseAgent):
-    def __init__(self, llm):
-        super().__init__(name="ComprehensiveClauseAnalyserAgent", llm=llm)
+    compact: bool = False
+
+    def __init__(
+        self,
+        llm,
+        router: Optional[LLMRouter] = None,
+        preferences: Optional[Dict[str, float]] = None,
+        compact: Optional[bool] = None,
+    ):
+        super().__init__(
+            name="ComprehensiveClauseAnalyserAgent",
+            llm=llm,
+            router=router,
+            preferences=preferences or {},
+            compact=compact_output_enabled() if compact is None else compact,
+        )
 
     def _heuristic_single(self, clause: str) -> dict:
+        record_degradation("heuristic_analysis")
         text = clause.lower()
         obligation_terms = [
             "shall", "must", "required", "agree", "obligated", "will",
@@ -132,11 +268,31 @@ Clause:
             data = json.loads(response)
             if isinstance(data, dict) and "risks" in data and "obligations" in data:
                 return data
+            record_degradation("unparsed_analysis")
             return {"risks": [], "obligations": []}
         except json.JSONDecodeError:
             return self._heuristic_single(clause)
 
     async def execute(self, clauses: list[str]) -> list[dict]:
+        if self.compact:
+            return await self._execute_compact(clauses)
+        return await self._execute_verbose(clauses)
+
+    async def _execute_compact(self, clauses: list[str]) -> list[dict]:
+        clauses_str = "\n".join([f"{i+1}. {clause}" for i, clause in enumerate(clauses)])
+        try:
+            response = await self._execute_with_retry(compact_batch_prompt(clauses_str))
+        except RateLimitError:
+            return [self._heuristic_single(c) for c in clauses]
+        except Exception:
+            return [self._heuristic_single(c) for c in clauses]
+        results = decode_compact(response, len(clauses))
+        if results is None:
+            # Model ignored the compact schema; fall back to the verbose prompt.
+            return await self._execute_verbose(clauses)
+        return results
+
+    async def _execute_verbose(self, clauses: list[str]) -> list[dict]:
         clauses_str = "\n".join([f"{i+1}. {clause}" for i, clause in enumerate(clauses)])
         prompt = f'''You are a contract analysis assistant.
 Task: For each clause, produce an array of JSON objects in the same order, each with keys "risks" and "obligations".
@@ -183,6 +339,7 @@ Clauses:
                         return retry_results
                 except json.JSONDecodeError:
                     pass
+                record_degradation("unparsed_analysis")
                 return [{"risks": [], "obligations": []}] * len(clauses)
         except json.JSONDecodeError:
             # One retry only, then return neutral defaults to avoid excessive API calls
@@ -204,11 +361,12 @@ Clauses:
                     return retry_results
             except json.JSONDecodeError:
                 pass
+            record_degradation("unparsed_analysis")
             return [{"risks": [], "obligations": []}] * len(clauses)
 
 class SummarizationAgent(CustomBaseAgent):
-    def __init__(self, llm):
-        super().__init__(name="SummarizationAgent", llm=llm)
+    def __init__(self, llm, router: Optional[LLMRouter] = None, preferences: Optional[Dict[str, float]] = None):
+        super().__init__(name="SummarizationAgent", llm=llm, router=router, preferences=preferences or {})
 
     async def execute(self, clauses: list[str], pages: list[int], ids: list[str]) -> str:
         lines = []
@@ -233,9 +391,11 @@ Do not truncate the summary.
 
 {text_to_summarize}'''
         try:
-            response = await self._execute_with_retry(prompt)
+            # A whole-document prompt that timed out will time out again; don't spend RPM re-sending it.
+            response = await self._execute_with_retry(prompt, retry_timeouts=False)
             return response
-        except RateLimitError:
+        except (RateLimitError, TimeoutError, asyncio.TimeoutError):
+            record_degradation("local_summary")
             if clauses:
                 sample = clauses[0][:200]
                 return f"Summary (local): {sample}"
@@ -0,0 +1,87 @@
+import json
+from typing import Any, Dict, List, Optional
+
+# Compact wire format for batch clause analysis:
+#   [[clause_no, [[description, sev, cat], ...], [[actor, action, deadline], ...]], ...]
+# clause_no is 1-based; clauses with no findings are omitted.
+SEVERITY_CODES = {"h": "high", "m": "medium", "l": "low"}
+CATEGORY_CODES = {
+    "li": "liability",
+    "te": "termination",
+    "pa": "payment",
+    "co": "confidentiality",
+    "in": "indemnification",
+    "cm": "compliance",
+    "ip": "intellectual property",
+    "di": "dispute resolution",
+    "pe": "performance",
+    "ot": "other",
+}
+
+
+def _legend(codes: Dict[str, str]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in codes.items())
+
+
+def compact_batch_prompt(clauses_str: str) -> str:
+    return f'''You are a contract analysis assistant.
+Task: Find risks and obligations in each numbered clause.
+Output format (compact, positional):
+- Return ONLY one JSON array of rows: [clause_no, risks, obligations]
+- risks: up to 2 arrays [description, severity_code, category_code]
+- obligations: up to 2 arrays [actor, action, deadline]; actor MUST be a term found in text (e.g., CONSULTANT, COMMISSION) or null; deadline null if none.
+- severity_code: {_legend(SEVERITY_CODES)}
+- category_code: {_legend(CATEGORY_CODES)}
+- Omit clauses with no risks and no obligations. No keys, no markdown, no prose.
+Example: [[1,[["Uncapped liability","h","li"]],[["SUPPLIER","Deliver goods","30 days"]]],[3,[],[["CLIENT","Pay invoices",null]]]]
+
+Clauses:
+"""
+{clauses_str}
+"""'''
+
+
+def _cell(row: List[Any], i: int) -> Any:
+    return row[i] if i < len(row) else None
+
+
+def decode_compact(text: str, count: int) -> Optional[List[Dict[str, Any]]]:
+    """Expand compact rows into the verbose per-clause shape; None if the payload is unusable."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        rows = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(rows, list):
+        return None
+    results: List[Dict[str, Any]] = [{"risks": [], "obligations": []} for _ in range(count)]
+    for row in rows:
+        if not isinstance(row, list) or not row or not isinstance(row[0], int):
+            return None
+        idx = row[0] - 1
+        if not 0 <= idx < count:
+            return None
+        risks = _cell(row, 1) or []
+        obligations = _cell(row, 2) or []
+        result = results[idx]
+        for r in risks:
+            if isinstance(r, list):
+                sev = _cell(r, 1)
+                cat = _cell(r, 2)
+                result["risks"].append({
+                    "description": _cell(r, 0),
+                    "severity": SEVERITY_CODES.get(sev, sev),
+                    "category": CATEGORY_CODES.get(cat, cat),
+                })
+        for o in obligations:
+            if isinstance(o, list):
+                result["obligations"].append({
+                    "actor": _cell(o, 0),
+                    "action": _cell(o, 1),
+                    "deadline": _cell(o, 2),
+                })
+    return results
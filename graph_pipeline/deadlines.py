@@ -0,0 +1,79 @@
+import math
+import os
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """Latency budget for one analysis run; ``None`` means unbounded."""
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds if budget_seconds else None
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return math.inf
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def call_timeout(self, cap: Optional[float]) -> Optional[float]:
+        timeout = min(self.remaining(), cap if cap else math.inf)
+        return None if math.isinf(timeout) else timeout
+
+
+_current_deadline: ContextVar[Deadline] = ContextVar("current_deadline", default=Deadline())
+
+
+def current_deadline() -> Deadline:
+    return _current_deadline.get()
+
+
+def set_deadline(deadline: Deadline):
+    return _current_deadline.set(deadline)
+
+
+def reset_deadline(token):
+    _current_deadline.reset(token)
+
+
+def budget_from_env() -> Optional[float]:
+    value = os.getenv("ANALYSIS_BUDGET_SECONDS")
+    return float(value) if value else None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter; never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, float(retry_after) + random.uniform(0, base))
+    return delay
+
+
+class LatencyTracker:
+    """Rolling per-model call latencies, used to decide when to hedge."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.size = size
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def add(self, key: str, latency: float):
+        self._samples.setdefault(key, deque(maxlen=self.size)).append(latency)
+
+    def p95(self, key: str) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)]
@@ -1,7 +1,8 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
+from contextvars import ContextVar
 import os
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
 from spoon_ai.graph.engine import StateGraph, END
 from spoon_ai.graph.builder import (
     DeclarativeGraphBuilder,
@@ -13,26 +14,59 @@ from .agents import (
     ClauseExtractionAgent,
     SummarizationAgent,
     ComprehensiveClauseAnalyserAgent,
+    collect_degradations,
+    fallback_enabled,
+    get_fallback_model,
+    get_rpm_limit,
+    record_degradation,
+    reset_degradations,
 )
+from .router import LLMRouter
+from .deadlines import Deadline, budget_from_env, current_deadline, reset_deadline, set_deadline
+from .results import ClauseTable
+from .revisions import plan_revision, redline
 from spoon_ai.chat import ChatBot
 
+ProgressCallback = Callable[[int, int], None]
+BatchCallback = Callable[[ClauseTable, int, int], None]
+
+PREFERRED_MODEL_WEIGHT = 4.0
+FALLBACK_MODEL_WEIGHT = 1.0
+
+_progress_callback: ContextVar[Optional[ProgressCallback]] = ContextVar("progress_callback", default=None)
+_batch_callback: ContextVar[Optional[BatchCallback]] = ContextVar("batch_callback", default=None)
+
+
+class CallbackError(RuntimeError):
+    """A caller-supplied progress or batch callback failed; never masked by the analysis fallback."""
+
 
 @dataclass
 class LegalAnalysisState:
     legal_text: str
-    clause_items: List[Dict[str, Any]] = field(default_factory=list)
-    clauses: List[str] = field(default_factory=list)
-    pages: List[int] = field(default_factory=list)
-    ids: List[str] = field(default_factory=list)
-    risks: List[str] = field(default_factory=list)
-    obligations: List[str] = field(default_factory=list)
+    # Clause texts/pages/ids travel in one table: the graph reducer merges list
+    # fields (and truncates them), but replaces other values by reference.
+    source: Optional[ClauseTable] = None
+    results: Optional[ClauseTable] = None
     summary: str = ""
+    previous_results: Optional[ClauseTable] = None
+    previous_summary: str = ""
+    redline: Dict[str, Any] = field(default_factory=dict)
+    degraded: List[str] = field(default_factory=list)
     execution_log: List[str] = field(default_factory=list)
 
 
 class LegalAnalysisGraph:
-    def __init__(self, analysis_model: str | None = None, summary_model: str | None = None):
-        api_key = os.getenv("GEMINI_API_KEY")
+    def __init__(
+        self,
+        analysis_model: str | None = None,
+        summary_model: str | None = None,
+        api_key: str | None = None,
+        router: Optional[LLMRouter] = None,
+    ):
+        api_keys = [api_key] if api_key else [k.strip() for k in os.getenv("GEMINI_API_KEYS", "").split(",") if k.strip()]
+        if not api_keys:
+            api_keys = [os.getenv("GEMINI_API_KEY") or ""]
 
         default_model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
         analysis_env = os.getenv("GEMINI_MODEL_ANALYSIS")
@@ -41,14 +75,31 @@ class LegalAnalysisGraph:
         analysis_model = analysis_model or analysis_env or default_model
         summary_model = summary_model or summary_env or default_model
 
-        analysis_bot = ChatBot(llm_provider="gemini", api_key=api_key, model_name=analysis_model)
-        summary_bot = ChatBot(llm_provider="gemini", api_key=api_key, model_name=summary_model)
+        analysis_preferences = self._preferences(analysis_model)
+        summary_preferences = self._preferences(summary_model)
+        # A shared router lets several graphs on the same keys respect one set of RPM quotas.
+        self.router = router if router is not None else LLMRouter([])
+        self.router.add_endpoints(
+            api_keys,
+            list(analysis_preferences) + list(summary_preferences),
+            client_factory=lambda key, model: ChatBot(llm_provider="gemini", api_key=key, model_name=model),
+            rpm_for_model=get_rpm_limit,
+        )
+        analysis_bot = next(e.client for e in self.router.endpoints if e.model == analysis_model)
+        summary_bot = next(e.client for e in self.router.endpoints if e.model == summary_model)
 
         self.clause_extractor = ClauseExtractionAgent(llm=analysis_bot)
-        self.comprehensive_analyzer = ComprehensiveClauseAnalyserAgent(llm=analysis_bot)
-        self.summarizer = SummarizationAgent(llm=summary_bot)
+        self.comprehensive_analyzer = ComprehensiveClauseAnalyserAgent(llm=analysis_bot, router=self.router, preferences=analysis_preferences)
+        self.summarizer = SummarizationAgent(llm=summary_bot, router=self.router, preferences=summary_preferences)
         self.graph_template = self._build_template()
 
+    @staticmethod
+    def _preferences(model: str) -> Dict[str, float]:
+        preferences = {model: PREFERRED_MODEL_WEIGHT}
+        if fallback_enabled():
+            preferences.setdefault(get_fallback_model(model), FALLBACK_MODEL_WEIGHT)
+        return preferences
+
     def _build_template(self) -> GraphTemplate:
         nodes = [
             NodeSpec(name="extract_clauses", handler=self.handle_clause_extraction),
@@ -60,85 +111,140 @@ class LegalAnalysisGraph:
         ]
         return GraphTemplate(entry_point="extract_clauses", nodes=nodes, edges=edges)
 
+    @staticmethod
+    def _report_progress(done: int, total: int):
+        callback = _progress_callback.get()
+        if callback is not None:
+            try:
+                callback(done, total)
+            except Exception as e:
+                raise CallbackError(f"on_progress failed: {e}") from e
+
+    @staticmethod
+    def _report_batch(table: ClauseTable, start: int, stop: int):
+        callback = _batch_callback.get()
+        if callback is not None and stop > start:
+            try:
+                callback(table, start, stop)
+            except Exception as e:
+                raise CallbackError(f"on_batch failed: {e}") from e
+
     async def handle_clause_extraction(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        if state.get('clause_items'):
-            texts = [item.get('text', '') for item in state['clause_items']]
-            pages = [item.get('page') for item in state['clause_items']]
-            ids = [item.get('id') for item in state['clause_items']]
-            return {
-                "clauses": texts,
-                "pages": pages,
-                "ids": ids,
-                "execution_log": state['execution_log'] + ["Loaded pre-segmented clauses"]
-            }
+        if state.get('source') is not None:
+            return {"execution_log": ["Loaded pre-segmented clauses"]}
         clauses = self.clause_extractor.execute(state['legal_text'])
-        return {"clauses": clauses, "pages": [None] * len(clauses), "ids": [None] * len(clauses), "execution_log": state['execution_log'] + ["Extracted clauses"]}
+        return {"source": ClauseTable(clauses), "execution_log": ["Extracted clauses"]}
+
+    async def _analyse_batch(self, batch: List[str]) -> List[Optional[Dict[str, Any]]]:
+        if current_deadline().expired:
+            return [self.comprehensive_analyzer._heuristic_single(c) for c in batch]
+        try:
+            batch_results = await self.comprehensive_analyzer.execute(batch)
+        except Exception:
+            batch_results = [self.comprehensive_analyzer._heuristic_single(c) for c in batch]
+        batch_results = list(batch_results[:len(batch)])
+        batch_results += [None] * (len(batch) - len(batch_results))
+        return batch_results
 
     async def handle_full_analysis(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        source: ClauseTable = state.get('source') or ClauseTable([])
+        clauses = source.texts
+        table = ClauseTable(clauses, source.pages, source.ids)
+        previous: Optional[ClauseTable] = state.get('previous_results')
         try:
-            clauses = state.get('clauses') or []
-            pages = state.get('pages') or [None] * len(clauses)
-            ids = state.get('ids') or [None] * len(clauses)
-            batch_size = max(min(20, len(clauses)), 1)
-            analysis_results: List[Dict[str, Any]] = []
-            for i in range(0, len(clauses), batch_size):
-                batch = clauses[i:i+batch_size]
-                try:
-                    batch_results = await self.comprehensive_analyzer.execute(batch)
-                except Exception:
-                    batch_results = [self.comprehensive_analyzer._heuristic_single(c) for c in batch]
-                analysis_results.extend(batch_results)
-
-            analysis: List[Dict[str, Any]] = []
-            for idx, clause in enumerate(clauses):
-                result = analysis_results[idx] if idx < len(analysis_results) else {"risks": [], "obligations": []}
-                analysis.append({
-                    "index": idx + 1,
-                    "clause_excerpt": clause[:200],
-                    "page": pages[idx] if idx < len(pages) else None,
-                    "id": ids[idx] if idx < len(ids) else None,
-                    "risks": result.get("risks", []),
-                    "obligations": result.get("obligations", []),
-                })
-
-            all_risks = [item["risks"] for item in analysis]
-            all_obligations = [item["obligations"] for item in analysis]
-
-            summary = await self.summarizer.execute(state['clauses'], pages, ids)
+            plan = plan_revision(previous, clauses) if previous is not None else None
+            reuse = plan.reuse if plan is not None else [None] * len(clauses)
+            pending = plan.pending if plan is not None else list(range(len(clauses)))
+            batch_size = 20
+            for b in range(0, len(pending), batch_size):
+                batch_idx = pending[b:b+batch_size]
+                batch_results = await self._analyse_batch([clauses[i] for i in batch_idx])
+                fresh = dict(zip(batch_idx, batch_results))
+                # Append in clause order: reused results up to the end of this batch, then the batch itself.
+                start = table.analysed
+                while table.analysed <= batch_idx[-1]:
+                    idx = table.analysed
+                    if idx in fresh:
+                        table.append_result(fresh[idx])
+                    else:
+                        table.copy_result(previous, reuse[idx])
+                self._report_batch(table, start, table.analysed)
+                self._report_progress(table.analysed, len(clauses))
+            start = table.analysed
+            while table.analysed < len(clauses):
+                table.copy_result(previous, reuse[table.analysed])
+            self._report_batch(table, start, table.analysed)
+
+            if plan is not None:
+                delta = redline(previous, table, plan)
+                log_message = f"Re-analysed {len(pending)} of {len(clauses)} clauses against previous version."
+            else:
+                delta = {}
+                log_message = "Analyzed risks and obligations in batches, then summarized."
+            if current_deadline().expired:
+                record_degradation("budget_exhausted")
+                log_message += " Latency budget exhausted; remaining clauses used heuristic analysis."
+
+            if plan is not None and plan.unchanged and state.get('previous_summary'):
+                summary = state['previous_summary']
+            else:
+                summary = await self.summarizer.execute(clauses, table.pages, table.ids)
 
             return {
-                "risks": all_risks,
-                "obligations": all_obligations,
+                "results": table,
                 "summary": summary,
-                "execution_log": state['execution_log'] + ["Analyzed risks and obligations in batches, then summarized."],
-                "analysis": analysis,
+                "redline": delta,
+                "execution_log": [log_message],
             }
+        except CallbackError:
+            raise
         except Exception:
             # Defensive fallback: return empty structured outputs so UI never crashes
-            clauses = state.get('clauses', [])
-            analysis = [{
-                "index": i + 1,
-                "clause_excerpt": (clauses[i] if i < len(clauses) else "")[:200],
-                "page": None,
-                "id": None,
-                "risks": [],
-                "obligations": [],
-            } for i in range(len(clauses))]
+            record_degradation("provider_error")
+            table = ClauseTable(clauses, source.pages, source.ids)
+            table.fill_empty()
             return {
-                "risks": [a["risks"] for a in analysis],
-                "obligations": [a["obligations"] for a in analysis],
+                "results": table,
                 "summary": "Summary (local): Unable to compute due to provider error",
-                "execution_log": state.get('execution_log', []) + ["Full analysis fallback due to error"],
-                "analysis": analysis,
+                "execution_log": ["Full analysis fallback due to error"],
             }
 
-    async def run(self, legal_text: str = "", clause_items: List[Dict[str, Any]] = None) -> dict:
+    async def run(
+        self,
+        legal_text: str = "",
+        clause_items: List[Dict[str, Any]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        on_batch: Optional[BatchCallback] = None,
+        previous_results: Optional[ClauseTable] = None,
+        previous_summary: str = "",
+        budget_seconds: Optional[float] = None,
+    ) -> dict:
         builder = DeclarativeGraphBuilder(state_schema=LegalAnalysisState)
         graph: StateGraph = builder.build(self.graph_template)
         app = graph.compile()
 
-        initial_state = LegalAnalysisState(legal_text=legal_text, clause_items=clause_items or [])
-
-        final_state = await app.invoke(asdict(initial_state))
-
+        initial_state = LegalAnalysisState(
+            legal_text=legal_text,
+            source=ClauseTable.from_items(clause_items) if clause_items else None,
+            previous_results=previous_results,
+            previous_summary=previous_summary,
+        )
+        # Shallow conversion so clause lists and result tables are passed by reference.
+        state = {f.name: getattr(initial_state, f.name) for f in fields(initial_state)}
+
+        token = _progress_callback.set(on_progress)
+        batch_token = _batch_callback.set(on_batch)
+        deadline_token = set_deadline(Deadline(budget_seconds or budget_from_env()))
+        degraded = set()
+        degraded_token = collect_degradations(degraded)
+        try:
+            final_state = await app.invoke(state)
+        finally:
+            reset_degradations(degraded_token)
+            reset_deadline(deadline_token)
+            _batch_callback.reset(batch_token)
+            _progress_callback.reset(token)
+
+        # Reasons any part of the answer came from a local fallback instead of the model.
+        final_state["degraded"] = sorted(degraded)
         return final_state
\ No newline at end of file
@@ -6,9 +6,7 @@ from dotenv import load_dotenv
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.ingestion.pdf_ingestor import PDFIngestor
-from .agents import get_rpm
-from graph_pipeline.graph import LegalAnalysisGraph
+from graph_pipeline.results import load_run, save_run
 
 load_dotenv()
 
@@ -17,21 +15,61 @@ async def main():
     parser.add_argument("--file-path", default="data/SampleContract-Shuttle.pdf", help="Path to the PDF file to analyze.")
     parser.add_argument("--analysis-model", default=None, help="LLM model for clause analysis (e.g., gemini-2.5-pro)")
     parser.add_argument("--summary-model", default=None, help="LLM model for summary (e.g., gemini-2.5-pro)")
+    parser.add_argument("--previous", default=None, help="Saved run of the previous contract version; only changed clauses are re-analysed.")
+    parser.add_argument("--budget", type=float, default=None, help="Latency budget in seconds; clauses left when it runs out use heuristic analysis.")
+    parser.add_argument("--index", default=None, help="SQLite corpus index to record this run's risks and obligations in.")
+    parser.add_argument("--save", default=None, help="Write this run's results to a JSON file for later --previous use.")
+    parser.add_argument("--export", default=None, help="Stream findings as batches finish to a .jsonl, .parquet (or dataset directory) or .arrow file.")
+    parser.add_argument("--doc-id", default=None, help="Document id for exported rows and the corpus index (defaults to the PDF's absolute path).")
     args = parser.parse_args()
     pdf_path = args.file_path
 
+    from app.ingestion import PDFIngestor
+    from graph_pipeline.agents import get_rpm
+    from graph_pipeline.graph import LegalAnalysisGraph
+
+    previous_summary, previous_results = ("", None)
+    if args.previous:
+        previous_summary, previous_results = load_run(args.previous)
+
     ingestor = PDFIngestor()
     clauses = ingestor.ingest(pdf_path)
     
+    # One id for export and index; a bare file name would let contract.pdf files in different folders collide.
+    doc_id = args.doc_id or os.path.abspath(pdf_path)
+    exporter = None
+    on_batch = None
+    if args.export:
+        from app.export import open_exporter
+        exporter = open_exporter(args.export)
+        on_batch = lambda table, start, stop: exporter.write_table(doc_id, table, start, stop)
+
     # Create and run the graph with page-aware clause items
     analysis_graph = LegalAnalysisGraph(analysis_model=args.analysis_model, summary_model=args.summary_model)
-    final_state = await analysis_graph.run(clause_items=clauses)
+    try:
+        final_state = await analysis_graph.run(
+            clause_items=clauses,
+            on_batch=on_batch,
+            previous_results=previous_results,
+            previous_summary=previous_summary,
+            budget_seconds=args.budget,
+        )
+    finally:
+        if exporter is not None:
+            exporter.close()
+    if args.save:
+        save_run(args.save, final_state['summary'], final_state.get('results'))
+    if args.index and final_state.get('results') is not None:
+        from app.index import SQLiteCorpusIndex
+        with SQLiteCorpusIndex(args.index) as index:
+            index.add_document(doc_id, final_state['results'], source=os.path.abspath(pdf_path))
 
     print("--- Legal Analysis Results ---")
     print("\n--- Summary ---")
     print(final_state['summary'])
     print("\n--- Clause Analysis ---")
-    for item in final_state.get('analysis', []):
+    results = final_state.get('results')
+    for item in (results.analysis() if results is not None else []):
         page = item.get('page')
         if page:
             print(f"Clause {item['index']} (p{page}): {item['clause_excerpt']}")
@@ -58,6 +96,16 @@ async def main():
                     print(f"  Obligation: {actor} -> {action}")
         else:
             print("  Obligation: none")
+    delta = final_state.get('redline')
+    if delta:
+        print("\n--- Changes Since Previous Version ---")
+        print(f"Clauses inserted: {delta['clauses_inserted']}, deleted: {delta['clauses_deleted']}, modified: {delta['clauses_modified']}")
+        for sign, key in (("+", "added_risks"), ("-", "removed_risks")):
+            for r in delta[key]:
+                print(f"  {sign} Risk (clause {r['clause']}): {r.get('description')} (severity: {r.get('severity')}, category: {r.get('category')})")
+        for sign, key in (("+", "added_obligations"), ("-", "removed_obligations")):
+            for o in delta[key]:
+                print(f"  {sign} Obligation (clause {o['clause']}): {o.get('actor')} -> {o.get('action')}")
     print("\n--- LLM Requests in Last Minute ---")
     print(get_rpm())
 
@@ -0,0 +1,224 @@
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _intern(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return sys.intern(str(value))
+
+
+def _severity(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return sys.intern(str(value).strip().lower())
+
+
+class ClauseTable:
+    """
+    Columnar store for per-clause analysis results.
+
+    Clause columns (texts, pages, ids) are held by reference. Risks and
+    obligations are flattened into parallel columns, addressed per clause
+    through offset arrays, with severity/category/actor strings interned.
+    """
+
+    __slots__ = (
+        "texts", "pages", "ids",
+        "risk_offsets", "risk_description", "risk_severity", "risk_category",
+        "obligation_offsets", "obligation_actor", "obligation_action", "obligation_deadline",
+    )
+
+    EXCERPT_CHARS = 200
+
+    def __init__(self, texts: List[str], pages: Optional[List[Optional[int]]] = None, ids: Optional[List[Optional[str]]] = None):
+        self.texts = texts
+        self.pages = pages if pages is not None else [None] * len(texts)
+        self.ids = ids if ids is not None else [None] * len(texts)
+        self.risk_offsets = array("l", [0])
+        self.risk_description: List[Optional[str]] = []
+        self.risk_severity: List[Optional[str]] = []
+        self.risk_category: List[Optional[str]] = []
+        self.obligation_offsets = array("l", [0])
+        self.obligation_actor: List[Optional[str]] = []
+        self.obligation_action: List[Optional[str]] = []
+        self.obligation_deadline: List[Optional[str]] = []
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ClauseTable":
+        texts = [item.get("text", "") for item in items]
+        pages = [item.get("page", item.get("page_number")) for item in items]
+        ids = [item.get("id") for item in items]
+        return cls(texts, pages, ids)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def analysed(self) -> int:
+        return len(self.risk_offsets) - 1
+
+    def append_result(self, result: Optional[Dict[str, Any]]):
+        if self.analysed >= len(self.texts):
+            raise IndexError("All clauses already have results")
+        result = result if isinstance(result, dict) else {}
+        for r in result.get("risks") or []:
+            if not isinstance(r, dict):
+                continue
+            self.risk_description.append(_text(r.get("description")))
+            self.risk_severity.append(_severity(r.get("severity")))
+            self.risk_category.append(_intern(r.get("category")))
+        for o in result.get("obligations") or []:
+            if not isinstance(o, dict):
+                continue
+            self.obligation_actor.append(_intern(o.get("actor")))
+            self.obligation_action.append(_text(o.get("action")))
+            self.obligation_deadline.append(_text(o.get("deadline")))
+        self.risk_offsets.append(len(self.risk_description))
+        self.obligation_offsets.append(len(self.obligation_actor))
+
+    def copy_result(self, other: "ClauseTable", idx: int):
+        if self.analysed >= len(self.texts):
+            raise IndexError("All clauses already have results")
+        r0, r1 = other.risk_offsets[idx], other.risk_offsets[idx + 1]
+        o0, o1 = other.obligation_offsets[idx], other.obligation_offsets[idx + 1]
+        self.risk_description.extend(other.risk_description[r0:r1])
+        self.risk_severity.extend(other.risk_severity[r0:r1])
+        self.risk_category.extend(other.risk_category[r0:r1])
+        self.obligation_actor.extend(other.obligation_actor[o0:o1])
+        self.obligation_action.extend(other.obligation_action[o0:o1])
+        self.obligation_deadline.extend(other.obligation_deadline[o0:o1])
+        self.risk_offsets.append(len(self.risk_description))
+        self.obligation_offsets.append(len(self.obligation_actor))
+
+    def extend_results(self, results: List[Dict[str, Any]]):
+        for result in results:
+            self.append_result(result)
+
+    def fill_empty(self):
+        while self.analysed < len(self.texts):
+            self.append_result(None)
+
+    # Views
+
+    def risks(self, idx: int) -> List[Dict[str, Any]]:
+        if idx >= self.analysed:
+            return []
+        return [
+            {
+                "description": self.risk_description[j],
+                "severity": self.risk_severity[j],
+                "category": self.risk_category[j],
+            }
+            for j in range(self.risk_offsets[idx], self.risk_offsets[idx + 1])
+        ]
+
+    def obligations(self, idx: int) -> List[Dict[str, Any]]:
+        if idx >= self.analysed:
+            return []
+        return [
+            {
+                "actor": self.obligation_actor[j],
+                "action": self.obligation_action[j],
+                "deadline": self.obligation_deadline[j],
+            }
+            for j in range(self.obligation_offsets[idx], self.obligation_offsets[idx + 1])
+        ]
+
+    def clause(self, idx: int) -> Dict[str, Any]:
+        return {
+            "index": idx + 1,
+            "clause_excerpt": (self.texts[idx] or "")[:self.EXCERPT_CHARS],
+            "page": self.pages[idx],
+            "id": self.ids[idx],
+            "risks": self.risks(idx),
+            "obligations": self.obligations(idx),
+        }
+
+    def analysis(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        stop = len(self.texts) if stop is None else min(stop, len(self.texts))
+        for idx in range(start, stop):
+            yield self.clause(idx)
+
+    def _risk_owner(self) -> Iterator[int]:
+        for idx in range(self.analysed):
+            for _ in range(self.risk_offsets[idx], self.risk_offsets[idx + 1]):
+                yield idx
+
+    def _obligation_owner(self) -> Iterator[int]:
+        for idx in range(self.analysed):
+            for _ in range(self.obligation_offsets[idx], self.obligation_offsets[idx + 1]):
+                yield idx
+
+    def risk_rows(self) -> Iterator[Dict[str, Any]]:
+        for j, idx in enumerate(self._risk_owner()):
+            yield {
+                "severity": self.risk_severity[j] or "",
+                "description": self.risk_description[j],
+                "category": self.risk_category[j],
+                "page": self.pages[idx],
+                "clause": idx + 1,
+                "id": self.ids[idx],
+            }
+
+    def obligation_rows(self) -> Iterator[Dict[str, Any]]:
+        for j, idx in enumerate(self._obligation_owner()):
+            yield {
+                "actor": self.obligation_actor[j],
+                "action": self.obligation_action[j],
+                "deadline": self.obligation_deadline[j],
+                "page": self.pages[idx],
+                "clause": idx + 1,
+                "id": self.ids[idx],
+            }
+
+    # Serialization
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "texts": self.texts,
+            "pages": self.pages,
+            "ids": self.ids,
+            "risk_offsets": self.risk_offsets.tolist(),
+            "risk_description": self.risk_description,
+            "risk_severity": self.risk_severity,
+            "risk_category": self.risk_category,
+            "obligation_offsets": self.obligation_offsets.tolist(),
+            "obligation_actor": self.obligation_actor,
+            "obligation_action": self.obligation_action,
+            "obligation_deadline": self.obligation_deadline,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ClauseTable":
+        table = cls(data.get("texts") or [], data.get("pages"), data.get("ids"))
+        table.risk_offsets = array("l", data.get("risk_offsets") or [0])
+        table.risk_description = data.get("risk_description") or []
+        table.risk_severity = [_intern(v) for v in data.get("risk_severity") or []]
+        table.risk_category = [_intern(v) for v in data.get("risk_category") or []]
+        table.obligation_offsets = array("l", data.get("obligation_offsets") or [0])
+        table.obligation_actor = [_intern(v) for v in data.get("obligation_actor") or []]
+        table.obligation_action = data.get("obligation_action") or []
+        table.obligation_deadline = data.get("obligation_deadline") or []
+        return table
+
+
+def save_run(path: str, summary: str, results: Optional[ClauseTable]):
+    payload = {"summary": summary, "results": results.to_dict() if results is not None else {}}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def load_run(path: str) -> Tuple[str, ClauseTable]:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload.get("summary", ""), ClauseTable.from_dict(payload.get("results") or {})
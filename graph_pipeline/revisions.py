@@ -0,0 +1,124 @@
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from .results import ClauseTable
+
+_WS = re.compile(r"\s+")
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def clause_hash(text: str) -> str:
+    normalized = _WS.sub(" ", (text or "").strip().lower())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=12).hexdigest()
+
+
+@dataclass
+class RevisionPlan:
+    """
+    Alignment of a new clause list against a previous run.
+
+    ``reuse[j]`` is the index of the previous clause whose results can be
+    reused for current clause ``j``, or None when it must be re-analysed.
+    """
+    reuse: List[Optional[int]]
+    opcodes: List[Opcode]
+
+    @property
+    def pending(self) -> List[int]:
+        return [j for j, i in enumerate(self.reuse) if i is None]
+
+    @property
+    def unchanged(self) -> bool:
+        return all(tag == "equal" for tag, *_ in self.opcodes)
+
+
+def plan_revision(previous: ClauseTable, texts: List[str]) -> RevisionPlan:
+    old_hashes = [clause_hash(t) for t in previous.texts[:previous.analysed]]
+    new_hashes = [clause_hash(t) for t in texts]
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    reuse: List[Optional[int]] = [None] * len(texts)
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            for k in range(j2 - j1):
+                reuse[j1 + k] = i1 + k
+    # Clauses that moved rather than changed still have results under their hash.
+    first_seen: Dict[str, int] = {}
+    for i, h in enumerate(old_hashes):
+        first_seen.setdefault(h, i)
+    for j, h in enumerate(new_hashes):
+        if reuse[j] is None and h in first_seen:
+            reuse[j] = first_seen[h]
+    return RevisionPlan(reuse=reuse, opcodes=opcodes)
+
+
+def _risk_key(r: Dict[str, Any]) -> Tuple:
+    return ((r.get("description") or "").strip().lower(), r.get("severity"), r.get("category"))
+
+
+def _obligation_key(o: Dict[str, Any]) -> Tuple:
+    return (o.get("actor"), (o.get("action") or "").strip().lower(), o.get("deadline"))
+
+
+def _findings(table: ClauseTable, ranges: List[Tuple[int, int]], kind: str) -> List[Dict[str, Any]]:
+    rows = []
+    for start, stop in ranges:
+        for idx in range(start, stop):
+            items = table.risks(idx) if kind == "risks" else table.obligations(idx)
+            for item in items:
+                rows.append({**item, "clause": idx + 1, "page": table.pages[idx], "id": table.ids[idx]})
+    return rows
+
+
+def _diff(old: List[Dict[str, Any]], new: List[Dict[str, Any]], key) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    old_counts = Counter(key(r) for r in old)
+    new_counts = Counter(key(r) for r in new)
+    added, removed = [], []
+    for r in new:
+        k = key(r)
+        if old_counts[k] > 0:
+            old_counts[k] -= 1
+        else:
+            added.append(r)
+    for r in old:
+        k = key(r)
+        if new_counts[k] > 0:
+            new_counts[k] -= 1
+        else:
+            removed.append(r)
+    return added, removed
+
+
+def redline(previous: ClauseTable, current: ClauseTable, plan: RevisionPlan) -> Dict[str, Any]:
+    delta: Dict[str, Any] = {
+        "clauses_inserted": 0,
+        "clauses_deleted": 0,
+        "clauses_modified": 0,
+        "added_risks": [],
+        "removed_risks": [],
+        "added_obligations": [],
+        "removed_obligations": [],
+    }
+    old_ranges, new_ranges = [], []
+    for tag, i1, i2, j1, j2 in plan.opcodes:
+        if tag == "equal":
+            continue
+        if tag == "insert":
+            delta["clauses_inserted"] += j2 - j1
+        elif tag == "delete":
+            delta["clauses_deleted"] += i2 - i1
+        else:
+            delta["clauses_modified"] += max(i2 - i1, j2 - j1)
+        old_ranges.append((i1, i2))
+        new_ranges.append((j1, j2))
+    # Diff all changed blocks together so a moved clause's findings cancel out.
+    for kind, key in (("risks", _risk_key), ("obligations", _obligation_key)):
+        added, removed = _diff(_findings(previous, old_ranges, kind), _findings(current, new_ranges, kind), key)
+        delta[f"added_{kind}"].extend(added)
+        delta[f"removed_{kind}"].extend(removed)
+    return delta
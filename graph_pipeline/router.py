@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+ClientFactory = Callable[[str, str], Any]
+
+WINDOW_SECONDS = 60.0
+DEFAULT_COOLDOWN_SECONDS = 30.0
+
+
+class Endpoint:
+    """One (API key, model) pair with its own RPM window and health."""
+
+    def __init__(self, api_key: str, model: str, rpm: int, client_factory: ClientFactory):
+        self.api_key = api_key
+        self.model = model
+        self.rpm = max(int(rpm), 1)
+        self._client_factory = client_factory
+        self._client = None
+        self._calls: Deque[float] = deque()
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.total_latency = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}@…{self.api_key[-4:]}" if self.api_key else self.model
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._client_factory(self.api_key, self.model)
+        return self._client
+
+    def _prune(self, now: float):
+        cutoff = now - WINDOW_SECONDS
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+
+    def used(self, now: float) -> int:
+        self._prune(now)
+        return len(self._calls)
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def free(self, now: float) -> int:
+        if not self.healthy(now):
+            return 0
+        return max(self.rpm - self.used(now), 0)
+
+    def next_available(self, now: float) -> float:
+        ready = self.cooldown_until
+        if self.used(now) >= self.rpm:
+            ready = max(ready, self._calls[0] + WINDOW_SECONDS)
+        return ready
+
+    def reserve(self, now: float):
+        self._calls.append(now)
+
+
+class LLMRouter:
+    """
+    Routes each LLM request to the endpoint with the most free capacity.
+
+    Preferences rank models strictly: a lower-weight (fallback) model is only
+    used when no higher-weight endpoint is healthy with free capacity, e.g.
+    after this request's 429s excluded them. Within a rank, endpoints are
+    scored as ``free / rpm``. Rate-limited endpoints cool down individually,
+    so a 429 only reroutes the request that hit it instead of switching
+    models for the whole process.
+    """
+
+    def __init__(self, endpoints: Iterable[Endpoint]):
+        self.endpoints: List[Endpoint] = list(endpoints)
+
+    @classmethod
+    def from_keys(
+        cls,
+        api_keys: Iterable[str],
+        models: Iterable[str],
+        client_factory: ClientFactory,
+        rpm_for_model: Callable[[str], int],
+    ) -> "LLMRouter":
+        router = cls([])
+        router.add_endpoints(api_keys, models, client_factory, rpm_for_model)
+        return router
+
+    def add_endpoints(
+        self,
+        api_keys: Iterable[str],
+        models: Iterable[str],
+        client_factory: ClientFactory,
+        rpm_for_model: Callable[[str], int],
+    ):
+        """Add an endpoint for every (key, model) pair not already routed."""
+        api_keys = list(api_keys)
+        seen = {(e.api_key, e.model) for e in self.endpoints}
+        for model in models:
+            for key in api_keys:
+                if (key, model) in seen:
+                    continue
+                seen.add((key, model))
+                self.endpoints.append(Endpoint(key, model, rpm_for_model(model), client_factory))
+
+    def _candidates(self, preferences: Dict[str, float], exclude: Set[Endpoint]) -> List[Endpoint]:
+        return [e for e in self.endpoints if preferences.get(e.model, 0) > 0 and e not in exclude]
+
+    def select(self, preferences: Dict[str, float], exclude: Optional[Set[Endpoint]] = None, now: Optional[float] = None) -> Optional[Endpoint]:
+        now = time.monotonic() if now is None else now
+        best, best_rank = None, (0.0, 0.0)
+        for endpoint in self._candidates(preferences, exclude or set()):
+            free = endpoint.free(now)
+            if free <= 0:
+                continue
+            rank = (preferences[endpoint.model], free / endpoint.rpm)
+            if rank > best_rank:
+                best, best_rank = endpoint, rank
+        return best
+
+    def try_acquire(self, preferences: Dict[str, float], exclude: Optional[Set[Endpoint]] = None) -> Optional[Endpoint]:
+        now = time.monotonic()
+        endpoint = self.select(preferences, exclude, now)
+        if endpoint is not None:
+            endpoint.reserve(now)
+        return endpoint
+
+    async def acquire(self, preferences: Dict[str, float], exclude: Optional[Set[Endpoint]] = None) -> Optional[Endpoint]:
+        """Reserve a request slot, waiting for capacity. Returns None if no candidate endpoint remains."""
+        exclude = exclude or set()
+        while True:
+            now = time.monotonic()
+            candidates = self._candidates(preferences, exclude)
+            if not candidates:
+                return None
+            endpoint = self.select(preferences, exclude, now)
+            if endpoint is not None:
+                endpoint.reserve(now)
+                return endpoint
+            wait = min(e.next_available(now) for e in candidates) - now
+            await asyncio.sleep(min(max(wait, 0.05), 1.0))
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        endpoint.successes += 1
+        endpoint.total_latency += latency
+
+    def record_rate_limit(self, endpoint: Endpoint, retry_after: Optional[float] = None):
+        endpoint.rate_limited += 1
+        endpoint.cooldown_until = time.monotonic() + (retry_after or DEFAULT_COOLDOWN_SECONDS)
+
+    def record_failure(self, endpoint: Endpoint):
+        endpoint.failures += 1
+
+    def capacity(self, models: Optional[Iterable[str]] = None) -> int:
+        models = set(models) if models is not None else None
+        return sum(e.rpm for e in self.endpoints if models is None or e.model in models)
+
+    def report(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        rows = []
+        for e in self.endpoints:
+            used = e.used(now)
+            rows.append({
+                "endpoint": e.name,
+                "model": e.model,
+                "rpm_limit": e.rpm,
+                "rpm_used": used,
+                "utilisation": round(used / e.rpm, 3),
+                "healthy": e.healthy(now),
+                "cooldown_seconds": round(max(e.cooldown_until - now, 0.0), 1),
+                "successes": e.successes,
+                "rate_limited": e.rate_limited,
+                "failures": e.failures,
+                "avg_latency_seconds": round(e.total_latency / e.successes, 3) if e.successes else None,
+            })
+        return rows
@@ -1,16 +1,17 @@
 import asyncio
+import argparse
 from dotenv import load_dotenv
-from app.ingestion import PDFIngestor
-from app.classification import LegalClassifier
-from app.extraction import ObligationExtractor
-from app.retrieval import FaissRetriever
-from app.summarization import GeminiSummarizer
 
 load_dotenv()
 
-import argparse
-
 async def main(file_path: str):
+    # Heavy backends (faiss, sentence-transformers, spoon_ai) load only once a run starts.
+    from app.ingestion import PDFIngestor
+    from app.classification import LegalClassifier
+    from app.extraction import ObligationExtractor
+    from app.retrieval import FaissRetriever
+    from app.summarization import GeminiSummarizer
+
     # 1. Ingestion
     ingestor = PDFIngestor()
     clauses = ingestor.ingest(file_path)